@@ -36,9 +36,13 @@ def import_csv(modeldb, filename):
     """Import a BikeReg csv racers list export file.
 
     Open BikeReg csv export file and populate the field and racer lists.
+
+    Returns a list of error messages, one per racer that couldn't be imported.
     """
     racer_table_model = modeldb.racer_table_model
 
+    racer_list = []
+
     with open(filename) as import_file:
         reader = csv.reader(import_file)
 
@@ -55,4 +59,6 @@ def import_csv(modeldb, filename):
             if 'One-day License' in field:
                 continue
 
-            racer_table_model.add_racer(bib, first_name, last_name, field, category, team, age)
+            racer_list.append((bib, first_name, last_name, field, category, team, age))
+
+    return racer_table_model.add_racer_list(racer_list)
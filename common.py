@@ -6,6 +6,8 @@ This module is a dumping ground for various utilities and constants that can be
 the package.
 """
 
+from functools import lru_cache
+from itertools import groupby
 import os
 import platform
 import sys
@@ -95,10 +97,34 @@ def pluralize(word, count):
 
     return '%s %s' % (count, word + 's')
 
+def row_runs(row_list):
+    """Takes a list of row numbers and returns a list of runs of consecutive rows.
+
+    Each run is a (first_row, count) tuple. Duplicate rows are ignored, and the runs are in
+    ascending order. Ex: [5, 1, 2, 3, 7, 6] -> [(1, 3), (5, 3)].
+    """
+    run_list = []
+
+    for _, run in groupby(enumerate(sorted(set(row_list))), lambda pair: pair[1] - pair[0]):
+        run = [row for _, row in run]
+        run_list.append((run[0], len(run)))
+
+    return run_list
+
 def enum(**enums):
     """Simulate an enum."""
     return type('Enum', (), enums)
 
+@lru_cache(maxsize=None)
+def shared_settings():
+    """Returns a QSettings instance that can be shared by widgets that save settings often.
+
+    Widgets that save their settings every time they are hidden can use this one instance, instead
+    of making (and syncing) a new QSettings each time. Call this only after the application's
+    organization and application names have been set, and sync() it when the widgets are done.
+    """
+    return QSettings()
+
 def get_documents_dir():
     """Returns the user's documents directory.
 
@@ -291,8 +291,12 @@ class MainCentralWidget(QWidget, CentralWidget):
         self.journal_table_view.hide()
 
         racer_in_field_table_view_dict = self.field_table_view.racer_in_field_table_view_dict
-        for _, racer_table_view in racer_in_field_table_view_dict.items():
-            racer_table_view.hide()
+        for racer_table_view in racer_in_field_table_view_dict.values():
+            if racer_table_view:
+                racer_table_view.hide()
+
+        # The views above saved their settings to the shared settings instance. Write them out now.
+        common.shared_settings().sync()
 
         self.modeldb.cleanup()
         self.modeldb = None
@@ -761,7 +765,12 @@ class TimingCatMainWindow(QMainWindow):
         if not import_filename:
             return
 
-        bikereg.import_csv(self.centralWidget().modeldb, import_filename)
+        error_list = bikereg.import_csv(self.centralWidget().modeldb, import_filename)
+        if error_list:
+            QMessageBox.warning(self, 'Error',
+                                'Skipped %s:\n\n%s' %
+                                (common.pluralize('racer', len(error_list)),
+                                 '\n'.join(error_list)))
 
         self.centralWidget().modeldb.add_defaults()
 
@@ -15,6 +15,7 @@ For example, simple authentication: get_race_list(('username', 'password'))
 
 import argparse
 import fnmatch
+from functools import lru_cache
 from getpass import getpass
 import json
 import os
@@ -229,25 +230,25 @@ def import_race(modeldb, auth, race):
 
     field_list = get_field_list(auth, race)
 
-    for field in field_list:
-        # Add the field here. In case there are no racers in the field, we want the field added
-        # anyway.
-        # Also, we need to keep field metadata (especially the checksum, which we will use to
-        # check if there are any changes in the field).
-        metadata = {'ontheday': {'url': field['category_entry_list_url'],
-                                 'checksum': field['entry_list_checksum']}}
-        field_table_model.add_field(field['name'], '', json.dumps(metadata))
-
-        # This is wall clock, date of today, which is what the reference clock
-        # is by default (before it's set to something else).
-        reference_clock = modeldb.race_table_model.get_reference_clock_datetime()
-
-        # This is start time expressed as wall time, from OnTheDay.net.
-        # i.e. start_clock is the actual start time (not relative to reference).
-        racer_list = get_racer_list(auth, field)
-
-        for racer in racer_list:
-            add_racer_to_modeldb(modeldb, racer, field['name'], field['time_start'])
+    # Do all of the OnTheDay.net requests up front, so that we don't hold the database transaction
+    # below open across network round trips.
+    field_racer_list = [(field, get_racer_list(auth, field)) for field in field_list]
+
+    # Add everything in one database transaction, rather than one per field and racer.
+    with modeldb.batch():
+        for field, racer_list in field_racer_list:
+            # Add the field here. In case there are no racers in the field, we want the field
+            # added anyway.
+            # Also, we need to keep field metadata (especially the checksum, which we will use to
+            # check if there are any changes in the field).
+            metadata = {'ontheday': {'url': field['category_entry_list_url'],
+                                     'checksum': field['entry_list_checksum']}}
+            field_table_model.add_field(field['name'], '', json.dumps(metadata))
+
+            # This is start time expressed as wall time, from OnTheDay.net.
+            # i.e. start_clock is the actual start time (not relative to reference).
+            for racer in racer_list:
+                add_racer_to_modeldb(modeldb, racer, field['name'], field['time_start'])
 
     # Set race data.
     race_table_model = modeldb.race_table_model
@@ -258,6 +259,16 @@ def import_race(modeldb, auth, race):
     notes = 'Imported from OnTheDay.net on %s.' % QDateTime.currentDateTime().toString(Qt.ISODate)
     race_table_model.set_race_property(race_table_model.NOTES, notes)
 
+@lru_cache(maxsize=4096)
+def time_from_string(time_string):
+    """Parse an OnTheDay.net time string (i.e. "10:16:00") into a QTime.
+
+    The same handful of time strings (a field's start time, in particular) come up over and over
+    again when importing racers, so the parsed results are cached. Callers must not modify the
+    returned QTime.
+    """
+    return QTime.fromString(time_string, Qt.ISODateWithMs)
+
 def add_racer_to_modeldb(modeldb, racer, field_name, field_start): #pylint: disable=too-many-branches
     """Adds a racer to the model, or updates an existing racer.
 
@@ -283,7 +294,7 @@ def add_racer_to_modeldb(modeldb, racer, field_name, field_start): #pylint: disa
         reference_datetime = QDateTime(QDate.currentDate())
 
         date = reference_datetime.date()
-        time = QTime.fromString(ontheday_watch_finish_time, Qt.ISODateWithMs)
+        time = time_from_string(ontheday_watch_finish_time)
         if time.isValid():
             datetime = QDateTime(date, time)
             finish = reference_datetime.msecsTo(datetime)
@@ -296,15 +307,13 @@ def add_racer_to_modeldb(modeldb, racer, field_name, field_start): #pylint: disa
         status = 'remote'
 
     if field_start:
-        start_clock = QDateTime(QDate.currentDate(),
-                                QTime.fromString(field_start, Qt.ISODateWithMs))
+        start_clock = QDateTime(QDate.currentDate(), time_from_string(field_start))
     else:
-        start_clock = QDateTime(QDate.currentDate(),
-                                QTime.fromString(racer['watch_start_time'], Qt.ISODateWithMs))
+        start_clock = QDateTime(QDate.currentDate(), time_from_string(racer['watch_start_time']))
 
     start = QDateTime(QDate.currentDate()).msecsTo(start_clock)
 
-    if modeldb.racer_table_model.racer_exists(str(racer['race_number'])):
+    if modeldb.racer_table_model.racer_exists(racer['race_number']):
         modeldb.racer_table_model.update_racer(racer['race_number'],
                                                racer['firstname'],
                                                racer['lastname'],
@@ -79,6 +79,55 @@ class ExtraColumnsProxyModel(QIdentityProxyModel):
         self.layout_change_persistent_indexes = []
         self.layout_change_proxy_columns = []
 
+        # Mapping between proxy and extra columns needs the source model's column count for every
+        # cell, so cache it (None means it needs to be fetched again).
+        self.source_column_count = None
+        # Connected here, before any view connects to us, so that views reacting to our reset
+        # (including the one setSourceModel() does) never see a column count from before it.
+        self.modelReset.connect(self.invalidateSourceColumnCount)
+
+    def setSourceModel(self, source_model): #pylint: disable=invalid-name
+        """Reimplemented.
+
+        Keep track of when the source model's column count could change, so that we know when to
+        throw away our cached copy of it.
+        """
+        old_source_model = self.sourceModel()
+        if old_source_model:
+            for signal in self.sourceColumnCountSignals(old_source_model):
+                signal.disconnect(self.invalidateSourceColumnCount)
+
+        # Throw the old count away before the reset, which views react to right away.
+        self.source_column_count = None
+        super().setSourceModel(source_model)
+
+        if source_model:
+            for signal in self.sourceColumnCountSignals(source_model):
+                signal.connect(self.invalidateSourceColumnCount)
+
+    @staticmethod
+    def sourceColumnCountSignals(source_model): #pylint: disable=invalid-name
+        """Return the source model signals that could mean the column count has changed.
+
+        Both the "about to" and the "done" signals are included, so that the cached column count
+        can't outlive the change, whichever order slots get called in.
+        """
+        return [source_model.columnsAboutToBeInserted, source_model.columnsInserted,
+                source_model.columnsAboutToBeRemoved, source_model.columnsRemoved,
+                source_model.modelAboutToBeReset, source_model.modelReset]
+
+    def invalidateSourceColumnCount(self, *args): #pylint: disable=invalid-name
+        """Throw away the cached source model column count."""
+        del args
+        self.source_column_count = None
+
+    def sourceColumnCount(self): #pylint: disable=invalid-name
+        """Return the source model's column count (cached)."""
+        if self.source_column_count is None:
+            self.source_column_count = self.sourceModel().columnCount()
+
+        return self.source_column_count
+
     def appendColumn(self, header): #pylint: disable=invalid-name
         """Append an extra column.
 
@@ -137,9 +186,10 @@ class ExtraColumnsProxyModel(QIdentityProxyModel):
         if not proxy_index.isValid():
             return QModelIndex()
 
+        # Extra columns have no source. Qt asks about them all the time (item data, selections,
+        # sorting), so this is expected, and not worth saying anything about.
         column = proxy_index.column()
-        if column >= self.sourceModel().columnCount():
-            print('Returning invalid index in mapToSource')
+        if column >= self.sourceColumnCount():
             return QModelIndex()
 
         return super().mapToSource(proxy_index)
@@ -147,7 +197,7 @@ class ExtraColumnsProxyModel(QIdentityProxyModel):
     def buddy(self, proxy_index):
         """Reimplemented."""
         column = proxy_index.column()
-        if column >= self.sourceModel().columnCount():
+        if column >= self.sourceColumnCount():
             return proxy_index
 
         return super().buddy(proxy_index)
@@ -166,7 +216,7 @@ class ExtraColumnsProxyModel(QIdentityProxyModel):
         if not self.sourceModel():
             return source_selection
 
-        source_column_count = self.sourceModel().columnCount()
+        source_column_count = self.sourceColumnCount()
         for item in selection:
             top_left = item.topLeft()
             top_left = top_left.sibling(top_left.row(), 0)
@@ -185,6 +235,11 @@ class ExtraColumnsProxyModel(QIdentityProxyModel):
 
     def columnCount(self, parent=QModelIndex()): #pylint: disable=invalid-name
         """Reimplemented."""
+        # Views ask for this all the time. Our source models are tables, so top level is all there
+        # is, and the cached source column count does.
+        if not parent.isValid() and self.sourceModel():
+            return self.sourceColumnCount() + len(self.extra_headers)
+
         return super().columnCount(parent) + len(self.extra_headers)
 
     def extraColumnCount(self, parent=QModelIndex()): #pylint: disable=invalid-name
@@ -257,7 +312,7 @@ class ExtraColumnsProxyModel(QIdentityProxyModel):
 
         This basically means subtracting the amount of columns in the source model.
         """
-        source_column_count = self.sourceModel().columnCount()
+        source_column_count = self.sourceColumnCount()
         if proxy_column >= source_column_count:
             return proxy_column - source_column_count
 
@@ -268,7 +323,7 @@ class ExtraColumnsProxyModel(QIdentityProxyModel):
 
         This basically means adding the amount of columns in the source model.
         """
-        return self.sourceModel().columnCount() + extra_column
+        return self.sourceColumnCount() + extra_column
 
 class RearrangeColumnsProxyModel(QIdentityProxyModel):
     """RearrangeColumnsProxyModel
@@ -400,8 +455,14 @@ class MSecsColumnsProxyModel(QIdentityProxyModel):
 
     This is a chance for us to filter the data coming in and out of the database. One thing we will
     be using this for is to filter racers based on field.
+
+    The raw msecs are fetched and stored through the base class, so this class can also be mixed in
+    ahead of ExtraColumnsProxyModel, to format msecs in extra columns without another proxy layer.
     """
 
+    # Most formatted msecs strings to remember.
+    MSECS_STRING_CACHE_SIZE = 16384
+
     def __init__(self, modeldb, parent=None):
         """Create an MSecsColumnsProxyModel proxy model.
 
@@ -413,8 +474,57 @@ class MSecsColumnsProxyModel(QIdentityProxyModel):
         self.msecs_from_reference_columns = []
         self.msecs_delta_columns = []
 
+        # data() wants to know whether a column holds msecs on every call, so keep a set of all of
+        # the msecs columns around, instead of concatenating and searching the lists every time.
+        self.msecs_column_set = frozenset()
+
         self.wall_times = defaults.WALL_TIMES
 
+        # Formatting msecs happens for every time cell on every repaint, but the same msecs always
+        # format to the same string (as long as the reference clock doesn't change), so remember
+        # the strings. Keyed by (msecs, whether msecs is from the reference clock).
+        self.msecs_string_cache = {}
+        self.reference_datetime = None
+
+        race_table_model = self.modeldb.race_table_model
+        race_table_model.dataChanged.connect(self.invalidate_msecs_string_cache)
+        race_table_model.rowsInserted.connect(self.invalidate_msecs_string_cache)
+        race_table_model.rowsRemoved.connect(self.invalidate_msecs_string_cache)
+        race_table_model.modelReset.connect(self.invalidate_msecs_string_cache)
+
+    def invalidate_msecs_string_cache(self, *args):
+        """Throw away the formatted msecs strings, because the reference clock could've changed."""
+        del args
+        self.msecs_string_cache.clear()
+        self.reference_datetime = None
+
+    def msecs_to_string(self, msecs, from_reference):
+        """Return msecs formatted as a time (cached).
+
+        If from_reference is True, msecs is relative to the reference clock. Otherwise, it is
+        relative to midnight.
+        """
+        key = (msecs, from_reference)
+        string = self.msecs_string_cache.get(key)
+
+        if string is None:
+            if from_reference:
+                if self.reference_datetime is None:
+                    race_table_model = self.modeldb.race_table_model
+                    self.reference_datetime = race_table_model.get_reference_clock_datetime()
+                reference_datetime = self.reference_datetime
+            else:
+                reference_datetime = QDateTime(QDate.currentDate())
+
+            string = reference_datetime.addMSecs(msecs).toString(defaults.DATETIME_FORMAT)
+
+            # Don't let the cache grow without bound over a long race.
+            if len(self.msecs_string_cache) >= self.MSECS_STRING_CACHE_SIZE:
+                self.msecs_string_cache.clear()
+            self.msecs_string_cache[key] = string
+
+        return string
+
     def set_wall_times(self, wall_times):
         """Set whether msecs columns should be expressed as wall times.
 
@@ -423,6 +533,8 @@ class MSecsColumnsProxyModel(QIdentityProxyModel):
         """
         self.wall_times = wall_times
 
+        # The cache is keyed on whether msecs is from the reference clock, which depends on
+        # wall_times, so it's still good. Just repaint.
         for column in self.msecs_from_reference_columns + self.msecs_delta_columns:
             top_left = self.index(0, column)
             bottom_right = self.index(self.rowCount(), column)
@@ -431,22 +543,20 @@ class MSecsColumnsProxyModel(QIdentityProxyModel):
     def setMSecsFromReferenceColumns(self, columns): #pylint: disable=invalid-name
         """Specify the columns that contain msecs from reference datetime."""
         self.msecs_from_reference_columns = columns
+        self.msecs_column_set = frozenset(self.msecs_from_reference_columns +
+                                          self.msecs_delta_columns)
 
     def setMSecsDeltaColumns(self, columns): #pylint: disable=invalid-name
         """Specify the columns that contain msecs from reference datetime."""
         self.msecs_delta_columns = columns
+        self.msecs_column_set = frozenset(self.msecs_from_reference_columns +
+                                          self.msecs_delta_columns)
 
     def data(self, index, role=Qt.DisplayRole):
         """Convert msecs to something that looks like a time."""
         if role in (Qt.DisplayRole, Qt.EditRole):
-            if index.column() in self.msecs_from_reference_columns + self.msecs_delta_columns:
-                race_table_model = self.modeldb.race_table_model
-                if index.column() in self.msecs_from_reference_columns and self.wall_times:
-                    reference_datetime = race_table_model.get_reference_clock_datetime()
-                else:
-                    reference_datetime = QDateTime(QDate.currentDate())
-
-                msecs = self.sourceModel().data(self.mapToSource(index), role)
+            if index.column() in self.msecs_column_set:
+                msecs = super().data(index, role)
 
                 if msecs == MSECS_UNINITIALIZED:
                     return ''
@@ -457,7 +567,9 @@ class MSecsColumnsProxyModel(QIdentityProxyModel):
                 elif msecs == MSECS_DNP:
                     return 'DNP'
 
-                return reference_datetime.addMSecs(msecs).toString(defaults.DATETIME_FORMAT)
+                from_reference = (index.column() in self.msecs_from_reference_columns and
+                                  self.wall_times)
+                return self.msecs_to_string(msecs, from_reference)
 
         return super().data(index, role)
 
@@ -465,7 +577,7 @@ class MSecsColumnsProxyModel(QIdentityProxyModel):
         """Convert the friendly representation back to msecs."""
 
         if role in (Qt.DisplayRole, Qt.EditRole):
-            if index.column() in self.msecs_from_reference_columns + self.msecs_delta_columns:
+            if index.column() in self.msecs_column_set:
                 if not value:
                     msecs = MSECS_UNINITIALIZED
                 elif value.upper() == 'DNS':
@@ -490,6 +602,6 @@ class MSecsColumnsProxyModel(QIdentityProxyModel):
                     else:
                         msecs = MSECS_UNINITIALIZED
 
-                return self.sourceModel().setData(self.mapToSource(index), msecs, role)
+                return super().setData(index, msecs, role)
 
         return super().setData(index, value, role)
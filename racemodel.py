@@ -15,6 +15,8 @@ various table classes don't operate independently from one another...there are i
 and they get to sibling tables via the ModelDatabase instance.
 """
 
+from contextlib import contextmanager
+from functools import lru_cache
 import os
 import sys
 from PyQt5.QtCore import QDate, QDateTime, QModelIndex, QObject, Qt, QTime
@@ -63,6 +65,12 @@ MSECS_DNF = -sys.maxsize + 2
 MSECS_DNP = -sys.maxsize + 3
 MSECS_SMALLEST_VALID = -sys.maxsize + 100
 
+# Brushes used to color-code table cells. Views ask for these on every repaint of every cell, so
+# just make them once.
+BRUSH_RED = QBrush(Qt.red)
+BRUSH_YELLOW = QBrush(Qt.yellow)
+BRUSH_GREEN = QBrush(Qt.green)
+
 def msecs_is_valid(msecs):
     """Returns whether msecs holds a valid (non-negative) elapsed time."""
     return msecs > MSECS_SMALLEST_VALID
@@ -124,6 +132,10 @@ class ModelDatabase(QObject):
     This is the top-level class that encapsulates all of the database tables.
     """
 
+    # Negative cache_size is in KiB rather than pages.
+    CACHE_SIZE_KIB = -64 * 1024 # 64 MiB
+    MMAP_SIZE_BYTES = 256 * 1024 * 1024 # 256 MiB
+
     def __init__(self, filename, new=False):
         """Initialize the ModelDatabase instance."""
         super().__init__()
@@ -142,9 +154,14 @@ class ModelDatabase(QObject):
 
         self.db.setDatabaseName(filename)
 
+        # Nesting depth of batch() blocks. Only the outermost one owns the transaction.
+        self.batch_depth = 0
+
         if not self.db.open():
             raise DatabaseError(self.db.lastError().text())
 
+        self.set_pragmas()
+
         # Make sure we make the journal table first, so we can immediately
         # start to use it.
         self.journal_table_model = JournalTableModel(self)
@@ -153,6 +170,67 @@ class ModelDatabase(QObject):
         self.racer_table_model = RacerTableModel(self)
         self.result_table_model = ResultTableModel(self)
 
+    def set_pragmas(self):
+        """Tune SQLite for our workload.
+
+        Once a race is going, the database is read far more often than it is written (every view
+        refresh reads it), and a race database is small enough to fit entirely in memory. So, give
+        SQLite a page cache big enough to hold the whole thing, and let it serve reads out of a
+        memory map instead of doing a read() syscall per page.
+        """
+        query = QSqlQuery(self.db)
+
+        for pragma in ['PRAGMA cache_size = %s;' % self.CACHE_SIZE_KIB,
+                       'PRAGMA mmap_size = %s;' % self.MMAP_SIZE_BYTES]:
+            if not query.exec(pragma):
+                raise DatabaseError(query.lastError().text())
+
+        query.finish()
+
+    @contextmanager
+    def batch(self):
+        """Group a bunch of database writes into a single transaction.
+
+        Use this as a context manager around bulk operations (imports, deleting many rows, etc.):
+
+        with modeldb.batch():
+            ...
+
+        Every write done by the table models inside the block is committed at the end of the block
+        in one shot (one commit, one fsync), instead of each write being its own transaction.
+        Batches can be nested; the inner ones just join the outermost one.
+
+        If an exception escapes the block, the transaction is rolled back, and the table models
+        re-select so that they don't keep showing the rolled back changes.
+        """
+        if self.batch_depth:
+            self.batch_depth += 1
+            try:
+                yield
+            finally:
+                self.batch_depth -= 1
+            return
+
+        if not self.db.transaction():
+            raise DatabaseError(self.db.lastError().text())
+
+        self.batch_depth = 1
+        try:
+            yield
+        except BaseException:
+            # Anything at all (even KeyboardInterrupt) must not leave the transaction open.
+            self.db.rollback()
+            for table_model in [self.journal_table_model, self.race_table_model,
+                                self.field_table_model, self.racer_table_model,
+                                self.result_table_model]:
+                table_model.select()
+            raise
+        finally:
+            self.batch_depth = 0
+
+        if not self.db.commit():
+            raise DatabaseError(self.db.lastError().text())
+
     def cleanup(self):
         """Close the database."""
         self.db.close()
@@ -211,6 +289,18 @@ class TableModel(QSqlRelationalTableModel):
     def add_defaults(self):
         """Add default table entries."""
 
+    def select_query(self):
+        """Make a query for read-only SELECT statements.
+
+        All of our ad-hoc SELECTs walk their results once, front to back, so make the query
+        forward-only. That way, the SQLite driver doesn't have to cache every row it has already
+        handed back to us just in case we want to seek backwards.
+        """
+        query = QSqlQuery(self.database())
+        query.setForwardOnly(True)
+
+        return query
+
     def add_column_flags(self, column, flags):
         """Add flags to specified column.
 
@@ -267,6 +357,31 @@ class TableModel(QSqlRelationalTableModel):
 
         return True
 
+    def remove_row_list(self, row_list):
+        """Remove a bunch of rows in one go.
+
+        Under the OnFieldChange edit strategy, QSqlTableModel only lets us remove one row at a
+        time, and each removal is its own DELETE plus a round of signals. So, accumulate the
+        removals (like change_reference_clock_datetime() does for edits), removing each run of
+        consecutive rows with a single removeRows(), and fire them all off in one shot.
+        """
+        run_list = common.row_runs(row_list)
+        if not run_list:
+            return
+
+        edit_strategy = self.editStrategy()
+        self.setEditStrategy(QSqlTableModel.OnManualSubmit)
+
+        try:
+            # Remove from the bottom up, so that the earlier row numbers stay valid.
+            for first_row, count in reversed(run_list):
+                if not self.removeRows(first_row, count):
+                    raise DatabaseError(self.lastError().text())
+
+            self.submitAll()
+        finally:
+            self.setEditStrategy(edit_strategy)
+
     def select(self):
         """Redefine this so we can raise an exception.
 
@@ -598,6 +713,19 @@ class FieldTableModel(TableModel):
         self.setHeaderData(self.subfields_column, Qt.Horizontal, 'Subfields')
         self.setHeaderData(self.metadata_column, Qt.Horizontal, 'Metadata')
 
+        # Row-indexed lists of field names and field IDs. Views need the field name or ID of a row
+        # on every repaint, and pulling a whole record() for that is wasteful, so build these
+        # lists once (on demand) and throw them away whenever this model changes.
+        self.row_name_list = None
+        self.row_id_list = None
+        self.id_name_dict = None
+        self.name_row_dict = None
+        self.dataChanged.connect(self.invalidate_row_lists)
+        self.rowsInserted.connect(self.invalidate_row_lists)
+        self.rowsRemoved.connect(self.invalidate_row_lists)
+        self.modelReset.connect(self.invalidate_row_lists)
+        self.layoutChanged.connect(self.invalidate_row_lists)
+
         self.select()
 
     def create_table(self):
@@ -619,29 +747,116 @@ class FieldTableModel(TableModel):
         if self.rowCount() == 0:
             self.add_field(defaults.FIELD_NAME)
 
+    def invalidate_row_lists(self, *args):
+        """Throw away the row-indexed field name and ID lists, because this model changed.
+
+        When called for dataChanged, the lists are kept if the change doesn't touch the ID or name
+        columns (for example, a metadata update).
+        """
+        if len(args) >= 2:
+            top_left, bottom_right = args[0], args[1]
+            if (top_left.isValid() and bottom_right.isValid() and
+                    not self.area_contains(top_left, bottom_right, self.id_column) and
+                    not self.area_contains(top_left, bottom_right, self.name_column)):
+                return
+
+        self.row_name_list = None
+        self.row_id_list = None
+        self.id_name_dict = None
+        self.name_row_dict = None
+
+    def build_row_lists(self):
+        """Build the row-indexed field name and ID lists, if they need building.
+
+        This also builds a field_id:name dictionary, for name_from_id(), and a name:row
+        dictionary, for row_from_name().
+        """
+        if self.row_name_list is not None and len(self.row_name_list) == self.rowCount():
+            return
+
+        self.row_name_list = []
+        self.row_id_list = []
+        for row in range(self.rowCount()):
+            self.row_name_list.append(self.data(self.index(row, self.name_column)))
+            self.row_id_list.append(self.data(self.index(row, self.id_column)))
+
+        self.id_name_dict = dict(zip(self.row_id_list, self.row_name_list))
+        self.name_row_dict = {name: row for row, name in enumerate(self.row_name_list)}
+
+    def id_list(self):
+        """Get the field IDs of all rows, in row order."""
+        self.build_row_lists()
+        return self.row_id_list
+
+    def name_at_row(self, row):
+        """Get field name of the specified row."""
+        self.build_row_lists()
+        return self.row_name_list[row]
+
+    def id_at_row(self, row):
+        """Get field ID of the specified row."""
+        self.build_row_lists()
+        return self.row_id_list[row]
+
+    def row_from_name(self, name):
+        """Get the row of the specified field name, or None if there is no such field."""
+        self.build_row_lists()
+        return self.name_row_dict.get(name)
+
     def name_from_id(self, field_id):
         """Get field name, from field ID."""
-        index_list = self.match(self.index(0, self.id_column),
-                                Qt.DisplayRole, field_id, 1, Qt.MatchExactly)
+        self.build_row_lists()
+        return self.id_name_dict.get(field_id)
 
-        if not index_list:
-            return None
+    def id_from_name(self, name):
+        """Get field ID, from field name.
 
-        index = index_list[0]
+        The field name column is UNIQUE, so this goes straight to the database and lets SQLite
+        probe the name index, rather than scanning the model row by row.
+        """
+        query = self.select_query()
+        query.prepare('SELECT "%s" FROM "%s" WHERE "%s" = :name;' %
+                      (self.ID, self.TABLE, self.NAME))
+        query.bindValue(':name', name)
 
-        return self.data(self.index(index.row(), self.name_column))
+        if not query.exec():
+            raise DatabaseError(query.lastError().text())
 
-    def id_from_name(self, name):
-        """Get field ID, from field name."""
-        index_list = self.match(self.index(0, self.name_column),
-                                Qt.DisplayRole, name, 1, Qt.MatchExactly)
+        field_id = None
+        if query.next():
+            field_id = query.value(0)
 
-        if not index_list:
-            return None
+        query.finish()
 
-        index = index_list[0]
+        return field_id
 
-        return self.data(self.index(index.row(), self.id_column))
+    def ids_from_names(self, name_list):
+        """Get field IDs for several field names at once.
+
+        Returns a dictionary of name:field_id, resolved with a single query. Names that don't
+        correspond to a field are left out of the dictionary.
+        """
+        name_list = list(name_list)
+        if not name_list:
+            return {}
+
+        query = self.select_query()
+        query.prepare('SELECT "%s", "%s" FROM "%s" WHERE "%s" IN (%s);' %
+                      (self.NAME, self.ID, self.TABLE, self.NAME,
+                       ', '.join(['?'] * len(name_list))))
+        for name in name_list:
+            query.addBindValue(name)
+
+        if not query.exec():
+            raise DatabaseError(query.lastError().text())
+
+        field_id_dict = {}
+        while query.next():
+            field_id_dict[query.value(0)] = query.value(1)
+
+        query.finish()
+
+        return field_id_dict
 
     def add_field(self, name, subfields='', metadata=EMPTY_JSON):
         """Add a row to the database table."""
@@ -694,7 +909,6 @@ class FieldTableModel(TableModel):
 
         index = index_list[0].siblingAtColumn(self.metadata_column)
         self.setData(index, metadata)
-        self.dataChanged.emit(index, index)
 
     def get_subfields(self, name):
         """Get the value of the subfields column of the row specified by the field name.
@@ -717,16 +931,19 @@ class FieldTableModel(TableModel):
         if role == Qt.BackgroundRole:
             racer_table_model = self.modeldb.racer_table_model
 
-            field_name = self.record(index.row()).value(self.NAME)
+            field_name = self.name_at_row(index.row())
+
+            total, finished, _ = racer_table_model.field_counts(field_name)
 
-            total = racer_table_model.racer_count_total_in_field(field_name)
-            finished = racer_table_model.racer_count_finished_in_field(field_name)
+            # Nobody has finished (which also covers an empty field), which is every field at the
+            # start of a race. The SQL model has no background of its own, so no need to ask it.
+            if finished == 0:
+                return None
 
-            if total != 0:
-                if finished == total:
-                    return QBrush(Qt.green)
-                elif finished > 0:
-                    return QBrush(Qt.yellow)
+            if finished == total:
+                return BRUSH_GREEN
+
+            return BRUSH_YELLOW
 
         return super().data(index, role)
 
@@ -794,6 +1011,26 @@ class RacerTableModel(TableModel):
                                                          FieldTableModel.ID,
                                                          FieldTableModel.NAME))
 
+        # Cache of field_name:(total, finished, status) racer counts. The field table views ask for
+        # these for every field row on every repaint, so don't rescan the racer table each time.
+        # Changes to this model throw away the affected fields' counts.
+        self.field_count_cache = {}
+        self.dataChanged.connect(self.invalidate_field_counts)
+        self.rowsInserted.connect(self.invalidate_field_counts)
+        self.rowsRemoved.connect(self.invalidate_field_counts)
+        self.modelReset.connect(self.invalidate_field_counts)
+        self.layoutChanged.connect(self.invalidate_field_counts)
+
+        # Dictionary of bib:row. Racers get looked up by bib all the time (submitting results,
+        # remote updates, popups), so don't match() through the whole model for each one. Thrown
+        # away whenever rows or bibs change.
+        self.bib_row_dict = None
+        self.dataChanged.connect(self.invalidate_bib_rows)
+        self.rowsInserted.connect(self.invalidate_bib_rows)
+        self.rowsRemoved.connect(self.invalidate_bib_rows)
+        self.modelReset.connect(self.invalidate_bib_rows)
+        self.layoutChanged.connect(self.invalidate_bib_rows)
+
         self.select()
 
     def create_table(self):
@@ -816,11 +1053,18 @@ class RacerTableModel(TableModel):
              '"%s" TEXT NOT NULL);' % self.METADATA):
             raise DatabaseError(query.lastError().text())
 
+        # Racers get looked up and counted by field (and counted by field and finish) a lot, so
+        # index those. Field lookups alone can use the leading column of this index.
+        if not query.exec(
+            'CREATE INDEX IF NOT EXISTS "%s_%s_%s" ' % (self.TABLE, self.FIELD, self.FINISH) +
+            'ON "%s" ("%s", "%s");' % (self.TABLE, self.FIELD, self.FINISH)):
+            raise DatabaseError(query.lastError().text())
+
         query.finish()
 
     def add_racer(self, bib, first_name, last_name, field, category, team, age,
                   start=MSECS_UNINITIALIZED, finish=MSECS_UNINITIALIZED, status='',
-                  metadata=EMPTY_JSON):
+                  metadata=EMPTY_JSON, field_id=None):
         """Add a row to the database table.
 
         Do some validation.
@@ -829,12 +1073,18 @@ class RacerTableModel(TableModel):
 
         Also, default QDateTime constructor makes an invalid time that ends up being stored as NULL
         in the table, which is what we want.
+
+        If the caller has already resolved the field name to its ID (see add_racer_list()), it can
+        pass that in as field_id to skip the field lookup.
         """
-        dup_racer_index = self.match(self.index(0, self.bib_column),
-                                     Qt.DisplayRole, bib, 1, Qt.MatchExactly)
-        if dup_racer_index:
-            dup_racer_first_name = dup_racer_index[0].siblingAtColumn(self.first_name_column).data()
-            dup_racer_last_name = dup_racer_index[0].siblingAtColumn(self.last_name_column).data()
+        # Only fall back to scanning the model (to get the duplicate racer's name) when the
+        # indexed lookup says there actually is a duplicate.
+        bib_index = None
+        if self.racer_exists(bib):
+            bib_index = self.bib_index(bib)
+        if bib_index is not None:
+            dup_racer_first_name = bib_index.siblingAtColumn(self.first_name_column).data()
+            dup_racer_last_name = bib_index.siblingAtColumn(self.last_name_column).data()
 
             dup_racer_name = ' '.join([dup_racer_first_name, dup_racer_last_name])
 
@@ -847,9 +1097,10 @@ class RacerTableModel(TableModel):
         # See if the field exists in our Field table.  If not, we add a new
         # field.
         if not field:
-            raise InputError('Racer field is missing.' % field)
+            raise InputError('Racer field is missing.')
 
-        field_id = self.modeldb.field_table_model.id_from_name(field)
+        if not field_id:
+            field_id = self.modeldb.field_table_model.id_from_name(field)
         if not field_id:
             self.modeldb.field_table_model.add_field(field)
             field_id = self.modeldb.field_table_model.id_from_name(field)
@@ -884,6 +1135,41 @@ class RacerTableModel(TableModel):
 
         self.insertRecord(-1, record)
 
+    def add_racer_list(self, racer_list):
+        """Add many rows to the database table in one go.
+
+        racer_list is a list of (bib, first_name, last_name, field, category, team, age) tuples,
+        the same as the leading arguments to add_racer(). This is meant for roster imports: the
+        field names are resolved to field IDs with a single query up front (adding any fields that
+        don't exist yet), instead of one lookup per racer, and all of the inserts are done in a
+        single batch() transaction.
+
+        A racer that fails validation doesn't stop the rest from being added. Returns a list of
+        error messages, one per racer that was skipped (empty if everyone made it in).
+        """
+        field_table_model = self.modeldb.field_table_model
+        error_list = []
+
+        with self.modeldb.batch():
+            field_name_set = {racer[3] for racer in racer_list if racer[3]}
+            field_id_dict = field_table_model.ids_from_names(field_name_set)
+
+            missing_field_name_set = field_name_set - field_id_dict.keys()
+            if missing_field_name_set:
+                for field_name in sorted(missing_field_name_set):
+                    field_table_model.add_field(field_name)
+                field_id_dict.update(field_table_model.ids_from_names(missing_field_name_set))
+
+            for racer in racer_list:
+                # Validation happens before anything is written, so skipping a bad racer leaves
+                # nothing behind in the transaction.
+                try:
+                    self.add_racer(*racer, field_id=field_id_dict.get(racer[3]))
+                except InputError as e:
+                    error_list.append(str(e))
+
+        return error_list
+
     def update_racer(self, bib, first_name, last_name, field, category, team, age, #pylint: disable=too-many-branches
                      start=MSECS_UNINITIALIZED, finish=MSECS_UNINITIALIZED, status='',
                      metadata=EMPTY_JSON):
@@ -896,9 +1182,8 @@ class RacerTableModel(TableModel):
         Also, default QDateTime constructor makes an invalid time that ends up being stored as NULL
         in the table, which is what we want.
         """
-        index_list = self.match(self.index(0, self.bib_column),
-                                Qt.DisplayRole, bib, 1, Qt.MatchExactly)
-        if not index_list:
+        bib_index = self.bib_index(bib)
+        if bib_index is None:
             raise InputError('Racer bib %s not found.' % bib)
 
         if first_name == '' and last_name == '':
@@ -907,7 +1192,7 @@ class RacerTableModel(TableModel):
         # See if the field exists in our Field table.  If not, we add a new
         # field.
         if not field:
-            raise InputError('Racer field is missing.' % field)
+            raise InputError('Racer field is missing.')
 
         field_id = self.modeldb.field_table_model.id_from_name(field)
         if not field_id:
@@ -917,135 +1202,160 @@ class RacerTableModel(TableModel):
         if field_id is None:
             raise InputError('Racer field "%s" is invalid.' % field)
 
-        record = self.record(index_list[0].row())
+        record = self.record(bib_index.row())
 
         if record.value(self.FIRST_NAME) != first_name:
-            index = index_list[0].siblingAtColumn(self.first_name_column)
+            index = bib_index.siblingAtColumn(self.first_name_column)
             self.setData(index, first_name)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.LAST_NAME) != last_name:
-            index = index_list[0].siblingAtColumn(self.last_name_column)
+            index = bib_index.siblingAtColumn(self.last_name_column)
             self.setData(index, last_name)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.FIELD) != field_id:
-            index = index_list[0].siblingAtColumn(self.field_column)
+            index = bib_index.siblingAtColumn(self.field_column)
             self.setData(index, field_id)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.CATEGORY) != category:
-            index = index_list[0].siblingAtColumn(self.category_column)
+            index = bib_index.siblingAtColumn(self.category_column)
             self.setData(index, category)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.TEAM) != team:
-            index = index_list[0].siblingAtColumn(self.team_column)
+            index = bib_index.siblingAtColumn(self.team_column)
             self.setData(index, team)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.AGE) != age:
-            index = index_list[0].siblingAtColumn(self.age_column)
+            index = bib_index.siblingAtColumn(self.age_column)
             self.setData(index, age)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.START) != start:
-            index = index_list[0].siblingAtColumn(self.start_column)
+            index = bib_index.siblingAtColumn(self.start_column)
             self.setData(index, start)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.FINISH) != finish:
-            index = index_list[0].siblingAtColumn(self.finish_column)
+            index = bib_index.siblingAtColumn(self.finish_column)
             self.setData(index, finish)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.STATUS) != status:
-            index = index_list[0].siblingAtColumn(self.status_column)
+            index = bib_index.siblingAtColumn(self.status_column)
             self.setData(index, status)
-            self.dataChanged.emit(index, index)
 
         if record.value(self.METADATA) != metadata:
-            index = index_list[0].siblingAtColumn(self.metadata_column)
+            index = bib_index.siblingAtColumn(self.metadata_column)
             self.setData(index, metadata)
-            self.dataChanged.emit(index, index)
 
     def delete_racer(self, bib):
         """Delete a row from the database table."""
-        index_list = self.match(self.index(0, self.bib_column),
-                                Qt.DisplayRole, bib, 1, Qt.MatchExactly)
+        bib_index = self.bib_index(bib)
 
-        if not index_list:
+        if bib_index is None:
             raise InputError('Failed to find racer with BIB %s' % bib)
 
-        index = index_list[0]
+        self.removeRow(bib_index.row())
 
-        self.removeRow(index.row())
+    def invalidate_bib_rows(self, *args):
+        """Throw away the bib:row dictionary, because this model changed.
+
+        When called for dataChanged, the dictionary is kept if the change doesn't touch the bib
+        column.
+        """
+        if len(args) >= 2:
+            top_left, bottom_right = args[0], args[1]
+            if (top_left.isValid() and bottom_right.isValid() and
+                    not self.area_contains(top_left, bottom_right, self.bib_column)):
+                return
+
+        self.bib_row_dict = None
+
+    def bib_index(self, bib):
+        """Return the index of the bib cell of the racer identified by "bib".
+
+        Returns None if there is no such racer.
+        """
+        if self.bib_row_dict is None:
+            self.bib_row_dict = {}
+            for row in range(self.rowCount()):
+                self.bib_row_dict[self.data(self.index(row, self.bib_column))] = row
+
+        # Bibs are stored as integers, but callers sometimes have them as strings.
+        try:
+            row = self.bib_row_dict.get(int(bib))
+        except (TypeError, ValueError):
+            return None
+
+        if row is None:
+            return None
+
+        return self.index(row, self.bib_column)
 
     def racer_exists(self, bib):
-        """Returns True if racer exists, otherwise False."""
-        index_list = self.match(self.index(0, self.bib_column),
-                                Qt.DisplayRole, bib, 1, Qt.MatchExactly)
+        """Returns True if racer exists, otherwise False.
 
-        return bool(index_list)
+        The bib column is UNIQUE, so this goes straight to the database and lets SQLite probe the
+        bib index, rather than scanning the model row by row.
+        """
+        query = self.select_query()
+        query.prepare('SELECT 1 FROM "%s" WHERE "%s" = :bib;' % (self.TABLE, self.BIB))
+        query.bindValue(':bib', bib)
+
+        if not query.exec():
+            raise DatabaseError(query.lastError().text())
+
+        exists = query.next()
+
+        query.finish()
+
+        return exists
 
     def get_racer_metadata(self, bib):
         """Returns the metadata of the racer identified by "bib"."""
-        index_list = self.match(self.index(0, self.bib_column),
-                                Qt.DisplayRole, bib, 1, Qt.MatchExactly)
+        bib_index = self.bib_index(bib)
 
-        if not index_list:
+        if bib_index is None:
             raise InputError('Failed to find racer with bib %s' % bib)
 
-        record = self.record(index_list[0].row())
+        record = self.record(bib_index.row())
         return record.value(self.METADATA)
 
     def set_racer_metadata(self, bib, metadata):
         """Returns the metadata of the racer identified by "bib"."""
-        index_list = self.match(self.index(0, self.bib_column),
-                                Qt.DisplayRole, bib, 1, Qt.MatchExactly)
+        bib_index = self.bib_index(bib)
 
-        if not index_list:
+        if bib_index is None:
             raise InputError('Failed to find racer with bib %s' % bib)
 
-        index = index_list[0].siblingAtColumn(self.metadata_column)
+        index = bib_index.siblingAtColumn(self.metadata_column)
         self.setData(index, metadata)
-        self.dataChanged.emit(index, index)
 
     def set_racer_start(self, bib, start):
         """Set start time of the racer identified by "bib"."""
-        index_list = self.match(self.index(0, self.bib_column),
-                                Qt.DisplayRole, bib, 1, Qt.MatchExactly)
+        bib_index = self.bib_index(bib)
 
-        if not index_list:
+        if bib_index is None:
             raise InputError('Failed to find racer with bib %s' % bib)
 
-        index = index_list[0].siblingAtColumn(self.start_column)
+        index = bib_index.siblingAtColumn(self.start_column)
         self.setData(index, start)
-        self.dataChanged.emit(index, index)
 
     def set_racer_finish(self, bib, finish):
         """Set finish time of the racer identified by "bib"."""
-        index_list = self.match(self.index(0, self.bib_column),
-                                Qt.DisplayRole, bib, 1, Qt.MatchExactly)
+        bib_index = self.bib_index(bib)
 
-        if not index_list:
+        if bib_index is None:
             raise InputError('Failed to find racer with bib %s' % bib)
 
-        index = index_list[0].siblingAtColumn(self.finish_column)
+        index = bib_index.siblingAtColumn(self.finish_column)
         self.setData(index, finish)
-        self.dataChanged.emit(index, index)
 
     def set_racer_status(self, bib, status):
         """Set finish time of the racer identified by "bib"."""
-        index_list = self.match(self.index(0, self.bib_column),
-                                Qt.DisplayRole, bib, 1, Qt.MatchExactly)
+        bib_index = self.bib_index(bib)
 
-        if not index_list:
+        if bib_index is None:
             raise InputError('Failed to find racer with bib %s' % bib)
 
-        index = index_list[0].siblingAtColumn(self.status_column)
+        index = bib_index.siblingAtColumn(self.status_column)
         self.setData(index, status)
-        self.dataChanged.emit(index, index)
 
     def assign_start_times(self, field_name, start, interval, dry_run=False):
         """Assign start times to racers.
@@ -1128,6 +1438,83 @@ class RacerTableModel(TableModel):
 
         return count
 
+    def racer_count_total_in_fields(self, field_id_list):
+        """Return total racers in the table that belong to any of the specified fields.
+
+        Unlike racer_count_total_in_field(), the fields are given by field ID, and the count is
+        done by a single query.
+        """
+        field_id_list = list(field_id_list)
+        if not field_id_list:
+            return 0
+
+        query = self.select_query()
+        query.prepare('SELECT COUNT(*) FROM "%s" WHERE "%s" IN (%s);' %
+                      (self.TABLE, self.FIELD, ', '.join(['?'] * len(field_id_list))))
+        for field_id in field_id_list:
+            query.addBindValue(field_id)
+
+        if not query.exec():
+            raise DatabaseError(query.lastError().text())
+
+        count = 0
+        if query.next():
+            count = query.value(0)
+
+        query.finish()
+
+        return count
+
+    def delete_racers_in_fields(self, field_id_list):
+        """Delete all racers that belong to any of the specified fields.
+
+        This is done by a single DELETE, followed by a single select(), instead of removing the
+        racers from the model one row at a time.
+        """
+        field_id_list = list(field_id_list)
+        if not field_id_list:
+            return
+
+        query = QSqlQuery(self.database())
+        query.prepare('DELETE FROM "%s" WHERE "%s" IN (%s);' %
+                      (self.TABLE, self.FIELD, ', '.join(['?'] * len(field_id_list))))
+        for field_id in field_id_list:
+            query.addBindValue(field_id)
+
+        if not query.exec():
+            raise DatabaseError(query.lastError().text())
+
+        query.finish()
+
+        self.select()
+
+    def racer_time_list(self, exclude_status):
+        """Return a list of (bib, start, finish) for racers that have both a start and a finish.
+
+        Racers whose status is exclude_status are left out. This is a single SELECT, so that
+        periodic callers (remotes pushing results) don't have to walk the whole model, record by
+        record, to find the handful of racers they care about.
+        """
+        query = self.select_query()
+        query.prepare('SELECT "%(bib)s", "%(start)s", "%(finish)s" FROM "%(racer)s" '
+                      'WHERE "%(start)s" > :smallest_valid AND "%(finish)s" > :smallest_valid '
+                      'AND "%(status)s" != :exclude_status;' %
+                      {'bib': self.BIB, 'start': self.START, 'finish': self.FINISH,
+                       'racer': self.TABLE, 'status': self.STATUS})
+        query.bindValue(':smallest_valid', MSECS_SMALLEST_VALID)
+        query.bindValue(':exclude_status', exclude_status)
+
+        if not query.exec():
+            raise DatabaseError(query.lastError().text())
+
+        racer_time_list = []
+        while query.next():
+            racer_time_list.append((query.value(0), query.value(1), query.value(2)))
+
+        query.finish()
+
+        return racer_time_list
+
     def racer_count_finished_in_field(self, field_name):
         """Return total finished racers in the table that belong to the specified field."""
         count = 0
@@ -1142,6 +1529,95 @@ class RacerTableModel(TableModel):
 
         return count
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def field_status(total, finished):
+        """Return the completion status string for a field with the given racer counts.
+
+        The percentage is rounded down with integer math, so a field that isn't quite complete
+        never shows up as 100%.
+        """
+        if total == 0:
+            return 'Empty'
+        elif finished < total:
+            return 'In Progress (%s%%)' % (finished * 100 // total)
+
+        return 'Complete'
+
+    def field_counts(self, field_name):
+        """Return (total, finished, status) for the specified field.
+
+        This is the cached equivalent of calling racer_count_total_in_field(),
+        racer_count_finished_in_field(), and field_status().
+        """
+        counts = self.field_count_cache.get(field_name)
+
+        if counts is None:
+            self.fill_field_counts()
+            counts = self.field_count_cache.get(field_name)
+
+        if counts is None:
+            # Not a field in the field table (shouldn't happen), so count the hard way.
+            total = self.racer_count_total_in_field(field_name)
+            finished = self.racer_count_finished_in_field(field_name)
+            counts = (total, finished, self.field_status(total, finished))
+            self.field_count_cache[field_name] = counts
+
+        return counts
+
+    def fill_field_counts(self):
+        """Fill in the field count cache for every field, with a single aggregate query.
+
+        Fields that are already in the cache are left alone.
+        """
+        field_table_model = self.modeldb.field_table_model
+
+        query = self.select_query()
+        query.prepare('SELECT "%(field)s"."%(name)s", COUNT("%(racer)s"."%(id)s"), '
+                      'TOTAL("%(racer)s"."%(finish)s" != :uninitialized) '
+                      'FROM "%(field)s" LEFT JOIN "%(racer)s" '
+                      'ON "%(racer)s"."%(field_id)s" = "%(field)s"."%(field_table_id)s" '
+                      'GROUP BY "%(field)s"."%(field_table_id)s";' %
+                      {'field': field_table_model.TABLE, 'name': field_table_model.NAME,
+                       'field_table_id': field_table_model.ID, 'racer': self.TABLE,
+                       'id': self.ID, 'finish': self.FINISH, 'field_id': self.FIELD})
+        query.bindValue(':uninitialized', MSECS_UNINITIALIZED)
+
+        if not query.exec():
+            raise DatabaseError(query.lastError().text())
+
+        while query.next():
+            field_name = query.value(0)
+            if field_name in self.field_count_cache:
+                continue
+
+            total = query.value(1)
+            finished = int(query.value(2))
+            self.field_count_cache[field_name] = (total, finished,
+                                                  self.field_status(total, finished))
+
+        query.finish()
+
+    def invalidate_field_counts(self, *args):
+        """Throw away cached field counts, because something in this model changed.
+
+        When called for dataChanged, only a change to the field or finish columns matters. If only
+        finish times changed, just the fields of the changed racers are thrown away.
+        """
+        if len(args) >= 2 and self.field_count_cache:
+            top_left, bottom_right = args[0], args[1]
+            if top_left.isValid() and bottom_right.isValid():
+                if self.area_contains(top_left, bottom_right, self.field_column):
+                    # We don't know which field the racer used to be in, so throw everything away.
+                    self.field_count_cache.clear()
+                elif self.area_contains(top_left, bottom_right, self.finish_column):
+                    for row in range(top_left.row(), bottom_right.row() + 1):
+                        field_name = self.data(self.index(row, self.field_column))
+                        self.field_count_cache.pop(field_name, None)
+                return
+
+        self.field_count_cache.clear()
+
     def set_remote(self, remote):
         """Do everything needed for a remote that has just been connected."""
         self.remote = remote
@@ -1155,38 +1631,43 @@ class RacerTableModel(TableModel):
         If a remote is connected, also show a different color for local result vs. result that
         has been submitted successfully to the remote.
         """
-        if role == Qt.BackgroundRole:
-            brush = None
-
-            record = self.record(index.row())
-
-            column = index.column
-            start = record.value(self.START)
-            finish = record.value(self.FINISH)
-
-            # No start time. Paint the start time cell red.
-            if (column == self.start_column and start == MSECS_UNINITIALIZED):
-                brush = QBrush(Qt.red)
-
-            # Finish time is before the start time. Paint the finish time cell red.
-            elif (column == self.finish_column and msecs_is_valid(finish) and finish < start):
-                brush = QBrush(Qt.red)
-
-            # If there is a remote, paint the row according to status.
-            elif self.remote:
-                if record.value(self.STATUS) == 'local':
-                    brush = QBrush(Qt.yellow)
-                elif record.value(self.STATUS) == 'remote':
-                    brush = QBrush(Qt.green)
-                elif record.value(self.STATUS) == 'rejected':
-                    brush = QBrush(Qt.red)
-            # No remote. Paint according to whether there is a finish time.
-            else:
-                if finish != MSECS_UNINITIALIZED:
-                    brush = QBrush(Qt.green)
-
-            if brush:
-                return brush
+        # Views ask for all sorts of roles on every repaint. Get everything but the background out
+        # of the way before doing any work.
+        if role != Qt.BackgroundRole:
+            return super().data(index, role)
+
+        brush = None
+
+        # Only fetch the cells we need, rather than copying out the whole row with record().
+        row = index.row()
+        column = index.column()
+        start = super().data(self.index(row, self.start_column))
+        finish = super().data(self.index(row, self.finish_column))
+
+        # No start time. Paint the start time cell red.
+        if (column == self.start_column and start == MSECS_UNINITIALIZED):
+            brush = BRUSH_RED
+
+        # Finish time is before the start time. Paint the finish time cell red.
+        elif (column == self.finish_column and msecs_is_valid(finish) and finish < start):
+            brush = BRUSH_RED
+
+        # If there is a remote, paint the row according to status.
+        elif self.remote:
+            status = super().data(self.index(row, self.status_column))
+            if status == 'local':
+                brush = BRUSH_YELLOW
+            elif status == 'remote':
+                brush = BRUSH_GREEN
+            elif status == 'rejected':
+                brush = BRUSH_RED
+        # No remote. Paint according to whether there is a finish time.
+        else:
+            if finish != MSECS_UNINITIALIZED:
+                brush = BRUSH_GREEN
+
+        if brush:
+            return brush
 
         return super().data(index, role)
 
@@ -1221,6 +1702,10 @@ class ResultTableModel(TableModel):
         self.setHeaderData(self.scratchpad_column, Qt.Horizontal, 'Bib')
         self.setHeaderData(self.finish_column, Qt.Horizontal, 'Finish')
 
+        # Results are always shown in finish order. Set that up before we select, rather than
+        # having the view sort us afterwards, which would just select everything all over again.
+        self.setSort(self.finish_column, Qt.AscendingOrder)
+
         self.select()
 
     def create_table(self):
@@ -1247,9 +1732,14 @@ class ResultTableModel(TableModel):
 
     def submit_result(self, row):
         """Submit a result to the racer table model, and remove from results table model."""
-        record = self.record(row)
-        bib = record.value(self.SCRATCHPAD)
-        finish = record.value(self.FINISH)
+        scratchpad = self.data(self.index(row, self.scratchpad_column))
+        finish = self.data(self.index(row, self.finish_column))
+
+        # The scratch pad is free text, but racer bibs are stored as integers. Convert here, at the
+        # boundary, so that the racer lookups compare integers with integers.
+        if not scratchpad.isdigit():
+            raise InputError('Invalid bib number "%s".' % scratchpad)
+        bib = int(scratchpad)
 
         self.modeldb.racer_table_model.set_racer_finish(bib, finish)
         self.modeldb.racer_table_model.set_racer_status(bib, 'local')
@@ -7,16 +7,17 @@ result scratch pad table view), as well as whatever proxy models are stacked bet
 and the models.
 """
 
-import os
-from PyQt5.QtCore import QEvent, QItemSelection, QModelIndex, QRegExp, QSettings, \
-                         QSortFilterProxyModel, Qt, pyqtSignal
+from contextlib import contextmanager
+from functools import lru_cache
+from PyQt5.QtCore import QEvent, QItemSelection, QModelIndex, QPersistentModelIndex, \
+                         QRegularExpression, QSortFilterProxyModel, Qt, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QDialog, QLabel, QMessageBox, QStyledItemDelegate, QTableView, \
                             QVBoxLayout
 import common
 import defaults
 from delegates import SqlRelationalDelegate
 from proxymodels import ExtraColumnsProxyModel, MSecsColumnsProxyModel
-from racemodel import InputError, FieldTableModel, Journal, ResultTableModel
+from racemodel import InputError, Journal
 from racemodel import msecs_is_valid, MSECS_UNINITIALIZED
 
 __copyright__ = '''
@@ -43,6 +44,78 @@ __maintainer__ = common.MAINTAINER
 __email__ = common.EMAIL
 __status__ = common.STATUS
 
+def selection_row_list(item_selection):
+    """Return the sorted row numbers covered by a QItemSelection.
+
+    For our table views, which all select whole rows, these are the same rows that
+    selectedRows() returns, but read straight off the selection ranges, rather than making a model
+    index (and its Python wrapper) for every selected row.
+    """
+    row_set = set()
+    for selection_range in item_selection:
+        row_set.update(range(selection_range.top(), selection_range.bottom() + 1))
+
+    return sorted(row_set)
+
+@contextmanager
+def bulk_update(view):
+    """Suspend repainting and sorting of a table view while doing a bulk model update.
+
+    Otherwise, the view (and its sorting proxy model, if it has one) repaints and re-sorts after
+    every single row that gets removed. Once the block is done, sorting is restored (which re-sorts
+    the view once, if it was enabled) and the view is repainted.
+
+    Only a sort/filter proxy model re-sorts as rows change, so sorting is only suspended for views
+    that have one. Anything else sorts in the SQL model, where turning sorting back on would mean
+    another select() on top of the one that the bulk update already did.
+    """
+    model = view.model()
+    sort_filter_proxy = isinstance(model, QSortFilterProxyModel)
+    sorting_enabled = view.isSortingEnabled()
+    dynamic_sort_filter = None
+    if sort_filter_proxy:
+        dynamic_sort_filter = model.dynamicSortFilter()
+        model.setDynamicSortFilter(False)
+
+    view.setUpdatesEnabled(False)
+    if sort_filter_proxy and sorting_enabled:
+        view.setSortingEnabled(False)
+
+    try:
+        yield
+    finally:
+        if sort_filter_proxy:
+            model.setDynamicSortFilter(dynamic_sort_filter)
+            if sorting_enabled:
+                view.setSortingEnabled(True)
+        view.setUpdatesEnabled(True)
+
+def restore_view_geometry(view, settings, default_size):
+    """Restore a view's geometry from the current settings group.
+
+    Settings written before the geometry was saved as a single key only have separate "size" and
+    "pos" keys, so fall back to those (save_view_geometry() replaces them), and then to
+    default_size.
+    """
+    geometry = settings.value('geometry')
+    if geometry is not None:
+        view.restoreGeometry(geometry)
+        return
+
+    view.resize(settings.value('size', default_size))
+    pos = settings.value('pos')
+    if pos is not None:
+        view.move(pos)
+
+def save_view_geometry(view, settings):
+    """Save a view's geometry to the current settings group.
+
+    The old "size" and "pos" keys, if any, are superseded by the "geometry" key, so remove them.
+    """
+    settings.setValue('geometry', view.saveGeometry())
+    settings.remove('size')
+    settings.remove('pos')
+
 class ReadOnlyStyledItemDelegate(QStyledItemDelegate):
     """Item delegate that makes a view read-only."""
     def createEditor(self, parent, option, index): #pylint: disable=invalid-name
@@ -51,6 +124,15 @@ class ReadOnlyStyledItemDelegate(QStyledItemDelegate):
         del option
         del index
 
+@lru_cache(maxsize=None)
+def read_only_delegate():
+    """Return the ReadOnlyStyledItemDelegate shared by all read-only views.
+
+    It has no state (and never makes editors), so there's no need for one per view. It's made on
+    first use, rather than at import time, so that the application object exists by then.
+    """
+    return ReadOnlyStyledItemDelegate()
+
 class JournalTableView(QTableView):
     """Table view for the journal table model."""
 
@@ -78,7 +160,7 @@ class JournalTableView(QTableView):
         self.hideColumn(self.source_model.id_column)
 
         # Make this table view read-only.
-        self.setItemDelegate(ReadOnlyStyledItemDelegate())
+        self.setItemDelegate(read_only_delegate())
 
         self.read_settings()
 
@@ -91,27 +173,24 @@ class JournalTableView(QTableView):
     def read_settings(self):
         """Read settings."""
         group_name = self.__class__.__name__
-        settings = QSettings()
+        settings = common.shared_settings()
         settings.beginGroup(group_name)
 
-        self.resize(settings.value('size', defaults.JOURNAL_TABLE_VIEW_SIZE))
+        restore_view_geometry(self, settings, defaults.JOURNAL_TABLE_VIEW_SIZE)
 
-        if settings.contains('pos'):
-            self.move(settings.value('pos'))
-
-        if settings.contains('horizontal_header_state'):
-            self.horizontalHeader().restoreState(settings.value('horizontal_header_state'))
+        horizontal_header_state = settings.value('horizontal_header_state')
+        if horizontal_header_state is not None:
+            self.horizontalHeader().restoreState(horizontal_header_state)
 
         settings.endGroup()
 
     def write_settings(self):
         """Write settings."""
         group_name = self.__class__.__name__
-        settings = QSettings()
+        settings = common.shared_settings()
         settings.beginGroup(group_name)
 
-        settings.setValue('size', self.size())
-        settings.setValue('pos', self.pos())
+        save_view_geometry(self, settings)
         settings.setValue('horizontal_header_state', self.horizontalHeader().saveState())
 
         settings.endGroup()
@@ -144,30 +223,28 @@ class FieldProxyModel(ExtraColumnsProxyModel):
         """Provide extra columns for racers finished, total racers, and field status."""
         if role == Qt.DisplayRole:
             field_table_model = self.sourceModel()
-            racer_table_model = self.sourceModel().modeldb.racer_table_model
+            racer_table_model = field_table_model.modeldb.racer_table_model
 
-            field_name = field_table_model.record(row).value(FieldTableModel.NAME)
+            field_name = field_table_model.name_at_row(row)
 
-            total = racer_table_model.racer_count_total_in_field(field_name)
-            finished = racer_table_model.racer_count_finished_in_field(field_name)
+            total, finished, status = racer_table_model.field_counts(field_name)
 
             if extra_column == self.FINISHED_SECTION:
                 return finished
             elif extra_column == self.TOTAL_SECTION:
                 return total
             elif extra_column == self.STATUS_SECTION:
-                if total == 0:
-                    return 'Empty'
-                elif finished < total:
-                    return 'In Progress (%s%%)' % int(round(finished * 100 / total))
-                else:
-                    return 'Complete'
+                return status
 
         return None
 
 class FieldTableView(QTableView):
     """Table view for the field table model."""
 
+    # How long to wait for a burst of racer table model changes to settle down before refreshing
+    # our non-model columns.
+    UPDATE_NON_MODEL_COLUMNS_DELAY_MS = 30
+
     def __init__(self, modeldb, parent=None):
         """Initialize the FieldTableView instance."""
         super().__init__(parent=parent)
@@ -186,29 +263,59 @@ class FieldTableView(QTableView):
 
         self.setWindowTitle('Fields')
 
-        # Set up our view.
+        # Set up our view. Like the racer table view, only set the sort indicator for now, and
+        # enable sorting once the saved header state is restored, so that we sort just once.
         self.setAlternatingRowColors(True)
-        self.setSortingEnabled(True) # Allow sorting by column
         self.setSelectionBehavior(QTableView.SelectRows)
-        self.sortByColumn(self.source_model.name_column, Qt.AscendingOrder)
+        self.horizontalHeader().setSortIndicator(self.source_model.name_column, Qt.AscendingOrder)
         self.horizontalHeader().setHighlightSections(False)
         self.horizontalHeader().setStretchLastSection(True)
         self.horizontalHeader().setSectionsMovable(True)
         self.verticalHeader().setVisible(False)
 
-        # For each field, we make a racer in field table view ahead of time.
-        # Note that we call dataChanged here because the initial reading of
-        # the model is not considered a data change, but we need to do this
-        # anyway to populate racer_in_field_table_view_dict.
+        # For each field, we keep a slot for a racer in field table view. The
+        # views themselves are only made the first time they are shown (see
+        # racer_in_field_table_view()), so until then the slot holds None.
+        # Note that we sync here because the initial reading of the model is
+        # not considered a data change, but we need to do this anyway to
+        # populate racer_in_field_table_view_dict. Call the sync directly,
+        # rather than going through dataChanged(), since there's nothing to
+        # repaint yet.
         self.racer_in_field_table_view_dict = {}
-        self.dataChanged(QModelIndex(), QModelIndex(), [])
+        self.sync_racer_in_field_table_views()
+
+        # Fields coming and going don't come with a dataChanged. In particular, deleting fields
+        # ends in a select(), which is just a model reset.
+        self.source_model.rowsInserted.connect(self.sync_racer_in_field_table_views)
+        self.source_model.rowsRemoved.connect(self.sync_racer_in_field_table_views)
+        self.source_model.modelReset.connect(self.sync_racer_in_field_table_views)
+
+        # Racer table model changes tend to come in bursts (imports, submitting a bunch of
+        # results, etc.), so coalesce them, and only refresh our non-model columns once when
+        # things settle down.
+        self.update_non_model_columns_timer = QTimer(self)
+        self.update_non_model_columns_timer.setSingleShot(True)
+        self.update_non_model_columns_timer.setInterval(self.UPDATE_NON_MODEL_COLUMNS_DELAY_MS)
+        self.update_non_model_columns_timer.timeout.connect(self.refresh_non_model_columns)
+
+        # Names of the fields whose non-model columns need refreshing when the timer fires.
+        self.pending_field_name_set = set()
+        # Whether every field's non-model columns need refreshing when the timer fires.
+        self.pending_all_fields = False
 
         # Signals/slots to handle racer in field table views.
         self.modeldb.racer_table_model.dataChanged.connect(self.update_non_model_columns)
+        # Racers coming and going (including deletes, which end in a select()) don't come with a
+        # dataChanged, and deleted racers have no field left to look up, so refresh every field.
+        self.modeldb.racer_table_model.rowsInserted.connect(self.update_all_non_model_columns)
+        self.modeldb.racer_table_model.rowsRemoved.connect(self.update_all_non_model_columns)
+        self.modeldb.racer_table_model.modelReset.connect(self.update_all_non_model_columns)
         self.doubleClicked.connect(self.handle_show_racer_in_field_table_view)
 
         self.read_settings()
 
+        self.setSortingEnabled(True) # Allow sorting by column
+
         # Always hide id, metadata column.
         self.hideColumn(self.source_model.id_column)
         self.hideColumn(self.source_model.metadata_column)
@@ -233,19 +340,18 @@ class FieldTableView(QTableView):
 
         On delete key press, delete the selection.
         """
-        model = self.selectionModel().model()
-        selection_list = self.selectionModel().selectedRows()
+        row_list = selection_row_list(self.selectionModel().selection())
 
         field_table_model = self.modeldb.field_table_model
         racer_table_model = self.modeldb.racer_table_model
 
-        field_count = len(selection_list)
-        racer_count = 0
-        for selection in selection_list:
-            field_record = field_table_model.record(selection.row())
-            field_id = field_record.value(FieldTableModel.ID)
+        # Look up each selected field's ID once, and reuse it for the actual deletion below.
+        field_id_dict = {}
+        for row in row_list:
+            field_id_dict[row] = field_table_model.id_at_row(row)
 
-            racer_count += racer_table_model.racer_count_total_in_field(field_id)
+        field_count = len(row_list)
+        racer_count = racer_table_model.racer_count_total_in_fields(field_id_dict.values())
 
         # Confirm deletion.
         msg_box = QMessageBox()
@@ -262,27 +368,12 @@ class FieldTableView(QTableView):
         if msg_box.exec() != QMessageBox.Ok:
             return
 
-        # Remove rows from large to small, because the rows are removed
-        # immediately, and cause the rest of the rows to shift, invalidating
-        # any row number that's higher than the currently removed one.
-        selection_list.sort(key=lambda selection: selection.row(), reverse=True)
-        for selection in selection_list:
-            field_record = field_table_model.record(selection.row())
-            field_id = field_record.value(FieldTableModel.ID)
-
-            racer_in_field_table_view = self.racer_in_field_table_view_dict[field_id]
-            racer_in_field_table_model = racer_in_field_table_view.model()
-
-            # Have to remove one row at a time from the proxy model. For some
-            # reason, a ranged removeRows() fails.
-            # Also, the removal is immediate, so we keep removing index 0.
-            for row in reversed(range(racer_in_field_table_model.rowCount())):
-                racer_in_field_table_model.removeRow(row)
-
-            model.removeRow(selection.row())
-
-        # Model retains blank rows until we select() again.
-        self.modeldb.field_table_model.select()
+        # Delete the racers in all of the doomed fields with one DELETE, straight from the racer
+        # table, since the fields' racer table views may not have been made yet.
+        # Our proxy model doesn't rearrange rows, so the selected rows are field table model rows.
+        with bulk_update(self), self.modeldb.batch():
+            racer_table_model.delete_racers_in_fields(field_id_dict.values())
+            field_table_model.remove_row_list(field_id_dict.keys())
 
     def dataChanged(self, top_left, bottom_right, roles): #pylint: disable=invalid-name
         """Handle model data changed.
@@ -292,6 +383,7 @@ class FieldTableView(QTableView):
         of field_id:racer_table_view of all field-specific racer table views, and in this method,
         we scan through the list of fields and update this dictionary accordingly.
         """
+        # Qt needs to see every change, so that the view gets repainted.
         super().dataChanged(top_left, bottom_right, roles)
 
         field_table_model = self.modeldb.field_table_model
@@ -300,27 +392,63 @@ class FieldTableView(QTableView):
         if roles and not Qt.DisplayRole in roles:
             return
 
-        if (top_left.isValid() and
-            (top_left.column() > field_table_model.name_column)):
+        # Only the field ID and name matter for our dictionary. Skip changes that don't touch
+        # either of those (subfields and metadata edits, our own extra column refreshes, etc.).
+        # Invalid indexes mean everything changed.
+        if (top_left.isValid() and bottom_right.isValid() and
+                not field_table_model.area_contains(top_left, bottom_right,
+                                                    field_table_model.id_column) and
+                not field_table_model.area_contains(top_left, bottom_right,
+                                                    field_table_model.name_column)):
             return
 
-        # Field table model changed. Go through the model to see if we need to
-        # make any new racer-in-field-table-views. Drop the ones we don't
-        # need anymore.
-        new_racer_table_view_dict = {}
-
-        for row in range(field_table_model.rowCount()):
-            record = field_table_model.record(row)
-            field_id = record.value(FieldTableModel.ID)
-            if field_id in self.racer_in_field_table_view_dict:
-                new_racer_table_view_dict[field_id] = self.racer_in_field_table_view_dict[field_id]
-                new_racer_table_view_dict[field_id].update_field_name()
-            else:
-                new_racer_table_view_dict[field_id] = RacerTableView(self.modeldb, field_id)
-                new_racer_table_view_dict[field_id].set_remote(self.remote)
-                new_racer_table_view_dict[field_id].connect_preferences(self.preferences)
+        self.sync_racer_in_field_table_views()
+
+    def sync_racer_in_field_table_views(self, *args):
+        """Bring racer_in_field_table_view_dict in line with the field table model.
 
-        self.racer_in_field_table_view_dict = new_racer_table_view_dict
+        Go through the model to see if we need to make any new racer-in-field-table-view slots.
+        Drop the ones we don't need anymore. Update the dictionary in place, so that when the set
+        of fields didn't change (just a rename, say), we don't churn through it.
+
+        Also connected straight to the field table model's row signals (see __init__()), so any
+        arguments are ignored.
+        """
+        del args
+
+        field_table_model = self.modeldb.field_table_model
+
+        field_id_set = set(field_table_model.id_list())
+
+        for field_id in self.racer_in_field_table_view_dict.keys() - field_id_set:
+            # If the view was ever made, get rid of it too, so that it doesn't hang around (with its
+            # whole proxy model stack) for a field that no longer exists.
+            racer_table_view = self.racer_in_field_table_view_dict.pop(field_id)
+            if racer_table_view:
+                racer_table_view.close()
+                racer_table_view.deleteLater()
+
+        for field_id in field_id_set - self.racer_in_field_table_view_dict.keys():
+            # Leave making the view until it is actually shown.
+            self.racer_in_field_table_view_dict[field_id] = None
+
+        # Only views that have actually been made can have a stale field name. Each of these is a
+        # no-op unless the field name actually changed.
+        for racer_table_view in self.racer_in_field_table_view_dict.values():
+            if racer_table_view:
+                racer_table_view.update_field_name()
+
+    def racer_in_field_table_view(self, field_id):
+        """Return the racer in field table view for the specified field, making it if needed."""
+        racer_table_view = self.racer_in_field_table_view_dict[field_id]
+
+        if not racer_table_view:
+            racer_table_view = RacerTableView(self.modeldb, field_id)
+            racer_table_view.set_remote(self.remote)
+            racer_table_view.connect_preferences(self.preferences)
+            self.racer_in_field_table_view_dict[field_id] = racer_table_view
+
+        return racer_table_view
 
     def handle_show_racer_in_field_table_view(self, model_index):
         """Handle activation of a field row.
@@ -336,9 +464,9 @@ class FieldTableView(QTableView):
             model_index.column() == field_table_model.subfields_column):
             return
 
-        field_id = field_table_model.record(model_index.row()).value(FieldTableModel.ID)
+        field_id = field_table_model.id_at_row(model_index.row())
 
-        self.racer_in_field_table_view_dict[field_id].show()
+        self.racer_in_field_table_view(field_id).show()
 
         self.clearSelection()
 
@@ -358,64 +486,124 @@ class FieldTableView(QTableView):
         about the column.  If a racer was added or removed, the finish time column of that racer
         will certainly be changed.
         """
-        if roles and not Qt.DisplayRole in roles:
+        # Most racer edits don't touch the finish column, so check that first, and inline, since
+        # this runs for every racer change.
+        racer_table_model = self.modeldb.racer_table_model
+        finish_column = racer_table_model.finish_column
+        if top_left.column() > finish_column or bottom_right.column() < finish_column:
             return
 
-        racer_table_model = self.modeldb.racer_table_model
-        if not racer_table_model.area_contains(top_left, bottom_right,
-                                               racer_table_model.finish_column):
+        if roles and not Qt.DisplayRole in roles:
             return
 
+        # Remember which fields the changed racers belong to, so that we only refresh those.
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            field_index = racer_table_model.index(row, racer_table_model.field_column)
+            self.pending_field_name_set.add(racer_table_model.data(field_index))
+
+        # Start the timer, unless it's already running. Don't restart it, or else a steady stream
+        # of racer changes (like a remote catching up) would keep pushing the refresh back.
+        if not self.update_non_model_columns_timer.isActive():
+            self.update_non_model_columns_timer.start()
+
+    def update_all_non_model_columns(self, *args):
+        """Handle racers being added to or removed from the racer table model.
+
+        Any field's counts could have changed, so refresh the non-model columns of every field
+        row, once the racer table model settles down.
+        """
+        del args
+
+        self.pending_all_fields = True
+
+        if not self.update_non_model_columns_timer.isActive():
+            self.update_non_model_columns_timer.start()
+
+    def refresh_non_model_columns(self):
+        """Refresh our non-model columns.
+
+        This is the deferred half of update_non_model_columns() and
+        update_all_non_model_columns(). Only the rows of the fields that had racers change (or all
+        of them, if racers were added or removed) are refreshed, one dataChanged() per run of
+        consecutive field rows for the extra columns, and one for the field table model columns'
+        background colors.
+        """
+        field_name_set = self.pending_field_name_set
+        self.pending_field_name_set = set()
+        all_fields = self.pending_all_fields
+        self.pending_all_fields = False
+
+        field_table_model = self.modeldb.field_table_model
         field_proxy_model = self.model()
 
-        row_start = 0
-        row_end = field_proxy_model.rowCount() - 1
+        # Our proxy model doesn't rearrange rows, so field table model rows are our rows. Look up
+        # just the changed fields' rows, instead of walking every field.
+        if all_fields:
+            row_list = list(range(field_table_model.rowCount()))
+        else:
+            row_list = []
+            for field_name in field_name_set:
+                row = field_table_model.row_from_name(field_name)
+                if row is not None:
+                    row_list.append(row)
+
         column_start = field_proxy_model.proxyColumnForExtraColumn(0)
         extra_column_count = field_proxy_model.extraColumnCount()
         column_end = field_proxy_model.proxyColumnForExtraColumn(extra_column_count - 1)
 
-        top_left = self.model().index(row_start, column_start, QModelIndex())
-        bottom_right = self.model().index(row_end, column_end, QModelIndex())
+        for row_start, row_count in common.row_runs(row_list):
+            row_end = row_start + row_count - 1
+
+            # The extra columns' text depends on the racer counts.
+            top_left = field_proxy_model.index(row_start, column_start, QModelIndex())
+            bottom_right = field_proxy_model.index(row_end, column_end, QModelIndex())
+
+            self.dataChanged(top_left, bottom_right, [Qt.DisplayRole])
+
+            # So do the field table model columns' background colors, but nothing else about them,
+            # so only say that the background changed.
+            top_left = field_proxy_model.index(row_start, 0, QModelIndex())
+            bottom_right = field_proxy_model.index(row_end, column_start - 1, QModelIndex())
 
-        self.dataChanged(top_left, bottom_right, [Qt.DisplayRole])
+            self.dataChanged(top_left, bottom_right, [Qt.BackgroundRole])
 
     def set_remote(self, remote):
         """Call set_remote() for each of our racer-in-field table views."""
         self.remote = remote
 
-        for _, racer_in_field_table_view in self.racer_in_field_table_view_dict.items():
-            racer_in_field_table_view.set_remote(remote)
+        for racer_in_field_table_view in self.racer_in_field_table_view_dict.values():
+            if racer_in_field_table_view:
+                racer_in_field_table_view.set_remote(remote)
 
     def connect_preferences(self, preferences):
         """Connect preferences signals to the various slots that care."""
         self.preferences = preferences
 
         for racer_table_view in self.racer_in_field_table_view_dict.values():
-            racer_table_view.connect_preferences(preferences)
+            if racer_table_view:
+                racer_table_view.connect_preferences(preferences)
 
     def read_settings(self):
         """Read settings."""
         group_name = self.__class__.__name__
-        settings = QSettings()
+        settings = common.shared_settings()
         settings.beginGroup(group_name)
 
-        self.resize(settings.value('size', defaults.FIELD_TABLE_VIEW_SIZE))
-        if settings.contains('pos'):
-            self.move(settings.value('pos'))
+        restore_view_geometry(self, settings, defaults.FIELD_TABLE_VIEW_SIZE)
 
-        if settings.contains('horizontal_header_state'):
-            self.horizontalHeader().restoreState(settings.value('horizontal_header_state'))
+        horizontal_header_state = settings.value('horizontal_header_state')
+        if horizontal_header_state is not None:
+            self.horizontalHeader().restoreState(horizontal_header_state)
 
         settings.endGroup()
 
     def write_settings(self):
         """Write settings."""
         group_name = self.__class__.__name__
-        settings = QSettings()
+        settings = common.shared_settings()
         settings.beginGroup(group_name)
 
-        settings.setValue('size', self.size())
-        settings.setValue('pos', self.pos())
+        save_view_geometry(self, settings)
         settings.setValue('horizontal_header_state', self.horizontalHeader().saveState())
 
         settings.endGroup()
@@ -423,23 +611,25 @@ class FieldTableView(QTableView):
     # Signals.
     visibleChanged = pyqtSignal(bool)
 
-class RacerTableExtraColumnsProxyModel(ExtraColumnsProxyModel):
+class RacerProxyModel(MSecsColumnsProxyModel, ExtraColumnsProxyModel):
     """Proxy model for adding columns to the racer table model.
 
     This proxy model adds extra columns to the racer table. Extra columns include time delta
     (between finish and start)...and that's all for now.
+
+    It also presents the msecs columns (including the delta column) in our preferred time format.
+    Doing both in one proxy saves a proxy layer's worth of index mapping for every cell.
     """
 
     DELTA_SECTION = 0
 
     def __init__(self, modeldb, parent=None):
-        """Initialize the RacerTableExtraColumnsProxyModel instance."""
-        super().__init__(parent=parent)
+        """Initialize the RacerProxyModel instance.
 
-        # Need the racer model (our source model) to look up start and finish times.
-        # Don't want to rely on our source model to actually be the racer model. It could be
-        # a proxy model.
-        self.modeldb = modeldb
+        Need the racer model (our source model) to look up start and finish times. Don't want to
+        rely on our source model to actually be the racer model. It could be a proxy model.
+        """
+        super().__init__(modeldb, parent=parent)
 
         self.appendColumn('Delta')
 
@@ -461,12 +651,15 @@ class RacerTableExtraColumnsProxyModel(ExtraColumnsProxyModel):
             else:
                 raise IndexError('Unknown extra column number %s' % extra_column)
 
-        # Make the rest of our data (background, etc.) the same as the finish column.
-        else:
+        # Make the background the same as the finish column. The racer table model doesn't have
+        # anything for the other roles, so don't bother asking it.
+        elif role == Qt.BackgroundRole:
             model = self.modeldb.racer_table_model
 
             return model.data(model.index(row, model.finish_column), role)
 
+        return None
+
     def setExtraColumnData(self, parent, row, extra_column, data, role):
         """Set extra column data."""
         if role == Qt.EditRole:
@@ -492,62 +685,98 @@ class RacerTableView(QTableView):
     """Table view for the racer table model."""
 
     def __init__(self, modeldb, field_id=None, parent=None):
-        """Initialize the RacerTableView instance."""
+        """Initialize the RacerTableView instance.
+
+        Setting up the proxy models and the rest of the view (which means sorting and filtering the
+        whole racer table) is put off until the view is first shown. See setVisible().
+        """
         super().__init__(parent=parent)
 
         self.setAttribute(Qt.WA_ShowWithoutActivating)
 
         self.modeldb = modeldb
         self.remote = None
+        self.preferences = None
 
         self.source_model = self.modeldb.racer_table_model
+        self.proxy_model_msecs = None
+        self.proxy_model_filter = None
+        self.parent_for_proxy_models = parent
+        self.built = False
+
+        self.field_id = field_id
+        self.field_name = None
+        self.update_field_name()
+
+    def setVisible(self, visible): #pylint: disable=invalid-name
+        """Reimplemented to set up the view the first time it is shown."""
+        if visible and not self.built:
+            self.build_view()
+
+        super().setVisible(visible)
 
-        # Proxy model to add some columns.
-        self.proxy_model_extra_columns = RacerTableExtraColumnsProxyModel(self.modeldb,
-                                                                          parent=parent)
-        self.proxy_model_extra_columns.setSourceModel(self.source_model)
+    def build_view(self):
+        """Set up the proxy models and the view.
 
-        # Proxy model to present the time fields in our preferred format.
-        self.proxy_model_msecs = MSecsColumnsProxyModel(self.modeldb, parent=parent)
-        delta_column = (self.source_model.columnCount() +
-                        RacerTableExtraColumnsProxyModel.DELTA_SECTION)
+        Only done once, right before the view is first shown.
+        """
+        self.built = True
+        parent = self.parent_for_proxy_models
+
+        # Proxy model to add some columns, and to present the time fields in our preferred format.
+        self.proxy_model_msecs = RacerProxyModel(self.modeldb, parent=parent)
+        delta_column = self.source_model.columnCount() + RacerProxyModel.DELTA_SECTION
         self.proxy_model_msecs.setMSecsFromReferenceColumns([self.source_model.start_column,
                                                              self.source_model.finish_column])
         self.proxy_model_msecs.setMSecsDeltaColumns([delta_column])
-        self.proxy_model_msecs.setSourceModel(self.proxy_model_extra_columns)
+        self.proxy_model_msecs.setSourceModel(self.source_model)
 
-        # Proxy model to potentially filter by field.
+        # Proxy model to potentially filter by field. Filtering isn't done in SQL (setFilter() on a
+        # racer table model of our own), because every racer view, the field counts, and the field
+        # table view's refreshes all depend on sharing the one racer table model, and an edit made
+        # through one model wouldn't show up in another until it gets select()ed again.
         self.proxy_model_filter = QSortFilterProxyModel(parent=parent)
+        # Each of these settings re-filters every source row, so settle the filter key column while
+        # there are no rows yet, and set the filter itself (just the once) below.
+        if self.field_id:
+            self.proxy_model_filter.setFilterKeyColumn(self.source_model.field_column)
         self.proxy_model_filter.setSourceModel(self.proxy_model_msecs)
         self.setModel(self.proxy_model_filter)
 
-        self.field_id = field_id
-        self.update_field_name()
+        # Now that there's a filter proxy model, set its filter.
+        if self.field_id:
+            self.set_field_filter()
 
-        # Set up our view.
-        self.setItemDelegateForColumn(self.source_model.field_column, SqlRelationalDelegate())
+        # Set up our view. Only set the sort indicator for now. Sorting gets enabled after the
+        # saved header state (which can have its own sort indicator) is restored, so that the whole
+        # racer table gets sorted just once, instead of once per step.
         self.setAlternatingRowColors(True)
-        self.setSortingEnabled(True) # Allow sorting by column
         self.setSelectionBehavior(QTableView.SelectRows)
-        self.sortByColumn(self.source_model.bib_column, Qt.AscendingOrder)
+        self.horizontalHeader().setSortIndicator(self.source_model.bib_column, Qt.AscendingOrder)
         self.horizontalHeader().setHighlightSections(False)
         self.horizontalHeader().setStretchLastSection(True)
         self.horizontalHeader().setSectionsMovable(True)
         self.verticalHeader().setVisible(False)
-        # Only hide field column if this table view is for a particular field.
+        # Only hide field column if this table view is for a particular field. Otherwise, the field
+        # can be edited, so give it the combo box editor (field-specific views never need one).
         if self.field_id:
-            self.proxy_model_filter.setFilterKeyColumn(self.source_model.field_column)
             self.hideColumn(self.source_model.field_column)
+        else:
+            self.setItemDelegateForColumn(self.source_model.field_column, SqlRelationalDelegate())
 
         self.read_settings()
 
+        self.setSortingEnabled(True) # Allow sorting by column
+
         # Hide the status by default. Show it if we have a remote
         # set up for this race.
-        self.hideColumn(self.source_model.status_column)
+        self.set_remote(self.remote)
         # Always hide id, metadata column.
         self.hideColumn(self.source_model.id_column)
         self.hideColumn(self.source_model.metadata_column)
 
+        self.connect_preferences(self.preferences)
+
     def keyPressEvent(self, event): #pylint: disable=invalid-name
         """Handle key presses."""
         if event.key() == Qt.Key_Escape:
@@ -568,10 +797,9 @@ class RacerTableView(QTableView):
 
         On delete key press, delete the selection.
         """
-        model = self.selectionModel().model()
-        selection_list = self.selectionModel().selectedRows()
+        row_list = selection_row_list(self.selectionModel().selection())
 
-        racer_count = len(selection_list)
+        racer_count = len(row_list)
 
         # Confirm deletion.
         msg_box = QMessageBox()
@@ -586,15 +814,19 @@ class RacerTableView(QTableView):
         if msg_box.exec() != QMessageBox.Ok:
             return
 
-        # Remove rows from large to small, because the rows are removed
-        # immediately, and cause the rest of the rows to shift, invalidating
-        # any row number that's higher than the currently removed one.
-        selection_list.sort(key=lambda selection: selection.row(), reverse=True)
-        for selection in selection_list:
-            model.removeRow(selection.row())
+        # Delete everything in one database transaction, rather than one per racer.
+        with bulk_update(self), self.modeldb.batch():
+            self.source_model.remove_row_list(self.source_row_list(row_list))
+
+    def source_row_list(self, row_list):
+        """Map a list of our model's rows to the corresponding racer table model rows.
+
+        Only the filter proxy (which also sorts) moves rows around. The proxy under it just adds
+        and reformats columns.
+        """
+        proxy_model = self.proxy_model_filter
 
-        # Model retains blank rows until we select() again.
-        self.modeldb.racer_table_model.select()
+        return [proxy_model.mapToSource(proxy_model.index(row, 0)).row() for row in row_list]
 
     def update_field_name(self):
         """Update the window title.
@@ -606,16 +838,36 @@ class RacerTableView(QTableView):
         """
         if self.field_id:
             field_name = self.modeldb.field_table_model.name_from_id(self.field_id)
+
+            # Nothing to do if the field name hasn't actually changed. In particular, we don't
+            # want to make our filter proxy model re-filter the whole racer table.
+            if field_name == self.field_name:
+                return
+            self.field_name = field_name
+
             self.setWindowTitle('Racers (%s)' % field_name)
-            regexp = '^' + QRegExp.escape(field_name) + '$'
-            self.proxy_model_filter.setFilterRegExp(QRegExp(regexp, Qt.CaseSensitive))
+            if self.built:
+                self.set_field_filter()
         else:
             self.setWindowTitle('Racers')
 
+    def set_field_filter(self):
+        """Filter our racers down to the ones in our field."""
+        # The filter itself runs in Qt for every racer row, so use QRegularExpression (PCRE,
+        # JIT-compiled) rather than the much slower, backtracking QRegExp engine. Fixed string
+        # filtering would be a substring match ("Men" would match "Women" too), and matching exactly
+        # in a filterAcceptsRow() override would mean a Python call per row, so anchor it instead.
+        regexp = '^' + QRegularExpression.escape(self.field_name) + '$'
+        self.proxy_model_filter.setFilterRegularExpression(QRegularExpression(regexp))
+
     def set_remote(self, remote):
         """Do everything needed for a remote that has just been connected."""
         self.remote = remote
 
+        # Nothing to show or hide yet. build_view() calls us again.
+        if not self.built:
+            return
+
         if self.remote:
             self.showColumn(self.source_model.status_column)
         else:
@@ -627,41 +879,51 @@ class RacerTableView(QTableView):
 
     def connect_preferences(self, preferences):
         """Connect preferences signals to the various slots that care."""
-        if not preferences:
+        self.preferences = preferences
+
+        # No proxy model to connect to yet. build_view() calls us again.
+        if not preferences or not self.built:
             return
 
         self.set_wall_times(preferences.wall_times_checkbox.isChecked())
         preferences.wall_times_checkbox.stateChanged.connect(self.proxy_model_msecs.set_wall_times)
 
-    def read_settings(self):
-        """Read settings."""
+    def settings_group_name(self):
+        """Return the settings group name for this racer table view.
+
+        Field-specific racer table views each get their own group, named after the field.
+        """
         group_name = self.__class__.__name__
         if self.field_id:
-            field_name = self.modeldb.field_table_model.name_from_id(self.field_id)
-            group_name = '_'.join([group_name, field_name])
-        settings = QSettings()
+            group_name = '_'.join([group_name, self.field_name])
+
+        return group_name
+
+    def read_settings(self):
+        """Read settings."""
+        group_name = self.settings_group_name()
+        settings = common.shared_settings()
         settings.beginGroup(group_name)
 
-        self.resize(settings.value('size', defaults.RACER_TABLE_VIEW_SIZE))
-        if settings.contains('pos'):
-            self.move(settings.value('pos'))
+        restore_view_geometry(self, settings, defaults.RACER_TABLE_VIEW_SIZE)
 
-        if settings.contains('horizontal_header_state'):
-            self.horizontalHeader().restoreState(settings.value('horizontal_header_state'))
+        horizontal_header_state = settings.value('horizontal_header_state')
+        if horizontal_header_state is not None:
+            self.horizontalHeader().restoreState(horizontal_header_state)
 
         settings.endGroup()
 
     def write_settings(self):
         """Write settings."""
-        group_name = self.__class__.__name__
-        if self.field_id:
-            field_name = self.modeldb.field_table_model.name_from_id(self.field_id)
-            group_name = '_'.join([group_name, field_name])
-        settings = QSettings()
+        # If we were never shown, there's nothing worth saving.
+        if not self.built:
+            return
+
+        group_name = self.settings_group_name()
+        settings = common.shared_settings()
         settings.beginGroup(group_name)
 
-        settings.setValue('size', self.size())
-        settings.setValue('pos', self.pos())
+        save_view_geometry(self, settings)
         settings.setValue('horizontal_header_state', self.horizontalHeader().saveState())
 
         settings.endGroup()
@@ -674,6 +936,9 @@ class ResultTableView(QTableView):
 
     RESULT_TABLE_POINT_SIZE = 20
 
+    # How long the mouse has to rest on a result before we pop up the racer info tool tip.
+    POPUP_DELAY_MS = 400
+
     def __init__(self, modeldb, parent=None):
         """Initialize the ResultTableView instance."""
         super().__init__(parent=parent)
@@ -693,7 +958,9 @@ class ResultTableView(QTableView):
         self.setAlternatingRowColors(True)
         self.setSortingEnabled(False) # Don't allow sorting.
         self.setSelectionBehavior(QTableView.SelectRows)
-        self.sortByColumn(self.source_model.finish_column, Qt.AscendingOrder)
+        # The result table model already sorts itself by finish. Just show that, because sorting the
+        # view would have the model re-select all of the results.
+        self.horizontalHeader().setSortIndicator(self.source_model.finish_column, Qt.AscendingOrder)
         self.horizontalHeader().setHighlightSections(False)
         self.horizontalHeader().setStretchLastSection(True)
         self.horizontalHeader().setSectionsMovable(True)
@@ -729,14 +996,25 @@ class ResultTableView(QTableView):
                 if index.isValid():
                     result_scratchpad_column = self.source_model.scratchpad_column
                     column = self.horizontalHeader().logicalIndex(result_scratchpad_column)
-                    self.show_popup(index.siblingAtColumn(column))
-                else:
+                    index = index.siblingAtColumn(column)
+
+                    # Still on the result whose tool tip is up. Leave it be.
+                    if self.popup.isVisible() and self.popup_index == index:
+                        return super().eventFilter(watched, event)
+
+                    # Don't build the tool tip until the mouse stops moving, so that sweeping
+                    # across the table doesn't build (and look up a racer for) every result
+                    # along the way.
                     self.popup.hide()
+                    self.popup_index = QPersistentModelIndex(index)
+                    self.popup_timer.start()
+                else:
+                    self.hide_popup()
             elif event.type() == QEvent.Leave:
-                self.popup.hide()
+                self.hide_popup()
         elif self.popup == watched:
             if event.type() == QEvent.Leave:
-                self.popup.hide()
+                self.hide_popup()
 
         return super().eventFilter(watched, event)
 
@@ -764,9 +1042,27 @@ class ResultTableView(QTableView):
         self.popup.setLayout(layout)
         self.popup.installEventFilter(self)
 
+        # The result to show the tool tip for, once the mouse has rested on it long enough.
+        self.popup_index = QPersistentModelIndex()
+        self.popup_timer = QTimer(self)
+        self.popup_timer.setSingleShot(True)
+        self.popup_timer.setInterval(self.POPUP_DELAY_MS)
+        self.popup_timer.timeout.connect(self.handle_popup_timeout)
+
         self.viewport().installEventFilter(self)
         self.setMouseTracking(True)
 
+    def handle_popup_timeout(self):
+        """Show the tool tip for the result the mouse has come to rest on."""
+        index = QModelIndex(self.popup_index)
+        if index.isValid():
+            self.show_popup(index)
+
+    def hide_popup(self):
+        """Hide the tool tip, and forget about any tool tip that's about to be shown."""
+        self.popup_timer.stop()
+        self.popup.hide()
+
     def show_popup(self, index):
         """Show the racer info tool tip.
 
@@ -781,13 +1077,10 @@ class ResultTableView(QTableView):
             text = 'Invalid bib number'
         else:
             racer_table_model = self.modeldb.racer_table_model
-            racer_bib_column = racer_table_model.bib_column
-            racer_index_list = racer_table_model.match(racer_table_model.index(0, racer_bib_column),
-                                                       Qt.DisplayRole, bib, 1, Qt.MatchExactly)
-            if not racer_index_list:
+            racer_index = racer_table_model.bib_index(bib)
+            if racer_index is None:
                 text = 'Unknown bib number'
             else:
-                racer_index = racer_index_list[0]
                 racer_first_name_column = racer_table_model.first_name_column
                 racer_first_name_index = racer_index.siblingAtColumn(racer_first_name_column)
                 racer_first_name = racer_first_name_index.data(Qt.DisplayRole)
@@ -798,14 +1091,19 @@ class ResultTableView(QTableView):
                 racer_team_index = racer_index.siblingAtColumn(racer_team_column)
                 racer_team = racer_team_index.data(Qt.DisplayRole)
 
-                text = ' '.join([racer_first_name, racer_last_name])
+                # Qt wants plain newlines, whatever the platform's line separator is.
                 if racer_team:
-                    text = (os.linesep+os.linesep).join([text, racer_team])
+                    text = '%s %s\n\n%s' % (racer_first_name, racer_last_name, racer_team)
+                else:
+                    text = '%s %s' % (racer_first_name, racer_last_name)
 
         rect = self.visualRect(index)
         self.popup.move(self.viewport().mapToGlobal(rect.bottomLeft()))
-        self.popup_label.setText(text)
-        self.popup.adjustSize()
+        # Same popup for every result, and consecutive popups often say the same thing (e.g. the
+        # same racer, or "Invalid bib number"), so only re-lay it out when the text changes.
+        if text != self.popup_label.text():
+            self.popup_label.setText(text)
+            self.popup.adjustSize()
         self.popup.show()
 
     def handle_delete(self):
@@ -816,26 +1114,25 @@ class ResultTableView(QTableView):
         race_table_model = self.modeldb.race_table_model
 
         item_selection = self.selectionModel().selection()
-        selection_list = self.selectionModel().selectedRows()
-
-        # Remove rows from large to small, because the rows are removed
-        # immediately, and cause the rest of the rows to shift, invalidating
-        # any row number that's higher than the currently removed one.
-        selection_list.sort(key=lambda selection: selection.row(), reverse=True)
-        for selection in selection_list:
-            record = self.source_model.record(selection.row())
-
-            reference_datetime = race_table_model.get_reference_clock_datetime()
-            bib = record.value(ResultTableModel.SCRATCHPAD)
-            msecs = record.value(ResultTableModel.FINISH)
+        row_list = selection_row_list(item_selection)
+
+        # Same reference datetime for every deleted result, so just look it up once.
+        reference_datetime = race_table_model.get_reference_clock_datetime()
+        scratchpad_column = self.source_model.scratchpad_column
+        finish_column = self.source_model.finish_column
+
+        for row in row_list:
+            # Just read the two cells we need, rather than copying out the whole row with record().
+            bib = self.source_model.data(self.source_model.index(row, scratchpad_column))
+            msecs = self.source_model.data(self.source_model.index(row, finish_column))
             finish = reference_datetime.addMSecs(msecs).toString(defaults.DATETIME_FORMAT)
 
             self.journal.log('Result with bib "%s" and time "%s" deleted.' % (bib, finish))
 
-            self.source_model.removeRow(selection.row())
-
-        # Model retains blank rows until we select() again.
-        self.modeldb.result_table_model.select()
+        # Our proxy model doesn't rearrange rows, so the selected rows are result table model rows.
+        # Delete everything in one database transaction, rather than one per result.
+        with bulk_update(self), self.modeldb.batch():
+            self.source_model.remove_row_list(row_list)
 
         # Selection changed because of this deletion, but for some reason,
         # this widget class doesn't emit the selectionChanged signal in this
@@ -859,37 +1156,58 @@ class ResultTableView(QTableView):
         """
         race_table_model = self.modeldb.race_table_model
 
-        selection_list = self.selectionModel().selectedRows()
-
-        # Remove rows from large to small, because the rows are removed
-        # immediately, and cause the rest of the rows to shift, invalidating
-        # any row number that's higher than the currently removed one.
-        selection_list.sort(key=lambda selection: selection.row(), reverse=True)
-        deleted_selection = QItemSelection()
-        for selection in selection_list:
-            try:
-                # Only try to submit it if it's a non-negative integer.
-                # Else, it is obviously a work in progress, so don't even
-                # bother.
-                record = self.source_model.record(selection.row())
-                scratchpad = record.value(ResultTableModel.SCRATCHPAD)
-                if scratchpad.isdigit():
-                    self.source_model.submit_result(selection.row())
-                    deleted_selection.select(selection, selection)
-
-                    reference_datetime = race_table_model.get_reference_clock_datetime()
-                    bib = record.value(ResultTableModel.SCRATCHPAD)
-                    msecs = record.value(ResultTableModel.FINISH)
-                    finish = reference_datetime.addMSecs(msecs).toString(defaults.DATETIME_FORMAT)
-
-                    self.journal.log('Result with bib "%s" and time "%s" submitted.' %
-                                     (bib, finish))
-
-            except InputError as e:
-                QMessageBox.warning(self, 'Error', str(e))
-
-        # Model retains blank rows until we select() again.
-        self.source_model.select()
+        # Same reference datetime for every submitted result, so just look it up once.
+        reference_datetime = race_table_model.get_reference_clock_datetime()
+        scratchpad_column = self.source_model.scratchpad_column
+        finish_column = self.source_model.finish_column
+
+        # Hold on to persistent indexes, which keep track of any row shifts as results get removed,
+        # so that we can just walk the selection in order.
+        persistent_list = [QPersistentModelIndex(selection)
+                           for selection in self.selectionModel().selectedRows()]
+
+        submitted_row_list = []
+        with bulk_update(self):
+            # Submit everything in one database transaction, rather than one per result.
+            with self.modeldb.batch():
+                for persistent in persistent_list:
+                    if not persistent.isValid():
+                        continue
+                    selection = QModelIndex(persistent)
+                    try:
+                        # Only try to submit it if it's a non-negative integer.
+                        # Else, it is obviously a work in progress, so don't even
+                        # bother.
+                        # Just read the two cells we need, rather than copying out the whole
+                        # row with record().
+                        row = selection.row()
+                        scratchpad = self.source_model.data(
+                            self.source_model.index(row, scratchpad_column))
+                        if scratchpad.isdigit():
+                            msecs = self.source_model.data(
+                                self.source_model.index(row, finish_column))
+
+                            self.source_model.submit_result(row)
+                            submitted_row_list.append(row)
+
+                            finish = reference_datetime.addMSecs(msecs).toString(
+                                defaults.DATETIME_FORMAT)
+
+                            self.journal.log('Result with bib "%s" and time "%s" submitted.' %
+                                             (scratchpad, finish))
+
+                    except InputError as e:
+                        QMessageBox.warning(self, 'Error', str(e))
+
+            # Selecting each submitted row into a QItemSelection as we go would merge it into the
+            # ranges so far, every time. Instead, select each run of consecutive rows just once.
+            deleted_selection = QItemSelection()
+            for first_row, count in common.row_runs(submitted_row_list):
+                deleted_selection.select(self.model().index(first_row, 0),
+                                         self.model().index(first_row + count - 1, 0))
+
+            # Model retains blank rows until we select() again.
+            self.source_model.select()
 
         # Surprisingly, when the model changes such that our selection changes
         # (for example, when the selected result gets submitted to the racer
@@ -913,26 +1231,24 @@ class ResultTableView(QTableView):
     def read_settings(self):
         """Read settings."""
         group_name = self.__class__.__name__
-        settings = QSettings()
+        settings = common.shared_settings()
         settings.beginGroup(group_name)
 
-        self.resize(settings.value('size', defaults.RESULT_TABLE_VIEW_SIZE))
-        if settings.contains('pos'):
-            self.move(settings.value('pos'))
+        restore_view_geometry(self, settings, defaults.RESULT_TABLE_VIEW_SIZE)
 
-        if settings.contains('horizontal_header_state'):
-            self.horizontalHeader().restoreState(settings.value('horizontal_header_state'))
+        horizontal_header_state = settings.value('horizontal_header_state')
+        if horizontal_header_state is not None:
+            self.horizontalHeader().restoreState(horizontal_header_state)
 
         settings.endGroup()
 
     def write_settings(self):
         """Write settings."""
         group_name = self.__class__.__name__
-        settings = QSettings()
+        settings = common.shared_settings()
         settings.beginGroup(group_name)
 
-        settings.setValue('size', self.size())
-        settings.setValue('pos', self.pos())
+        save_view_geometry(self, settings)
         settings.setValue('horizontal_header_state', self.horizontalHeader().saveState())
 
         settings.endGroup()
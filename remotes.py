@@ -6,6 +6,7 @@ This module contains implementations for the optional remotes that can be used.
 remote service on which we can push results (typically, racer finishes).
 """
 
+from collections import namedtuple
 import json
 from random import random
 import sys
@@ -50,6 +51,10 @@ Status = common.enum(
     TimedOut=2,
 )
 
+# A racer update to be pushed to a remote. This is built for every racer that needs pushing, so
+# use a namedtuple rather than a dict to keep it small and cheap to access.
+RacerUpdate = namedtuple('RacerUpdate', ['bib', 'start', 'finish', 'row'])
+
 def get_remote_class_list():
     """Return a list of remote class types.
 
@@ -194,7 +199,7 @@ class SimulatedRemote(Remote):
     def submit_racer_update(self, update_list):
         """Submit a list of racer updates.
 
-        Expects a list of dictionaries each with "bib", "start", and "finish" keys.
+        Expects a list of RacerUpdate instances.
         """
         if random() > self.failure_rate:
             self.submit_success(update_list)
@@ -210,14 +215,14 @@ class SimulatedRemote(Remote):
         print('Submit SUCCESS:')
         for update in update_list:
             print('    bib = %s, start = %s, finish = %s' %
-                  (update['bib'], update['start'], update['finish']))
+                  (update.bib, update.start, update.finish))
 
     def submit_failure(self, update_list):
         """Print a diagnostic debug message showing submit failure."""
         print('Submit FAILURE:')
         for update in update_list:
             print('    bib = %s, start = %s, finish = %s' %
-                  (update['bib'], update['start'], update['finish']))
+                  (update.bib, update.start, update.finish))
 
     def remote_update(self):
         """Iterate through all racers and push local updates to remote."""
@@ -226,31 +231,25 @@ class SimulatedRemote(Remote):
 
         submit_list = []
 
-        # First, gather the list of updates and try pushing to remote.
-        for row in range(racer_table_model.rowCount()):
-            record = racer_table_model.record(row)
-
-            bib = record.value(racer_table_model.BIB)
-            start = record.value(racer_table_model.START)
-            finish = record.value(racer_table_model.FINISH)
-            status = record.value(racer_table_model.STATUS)
+        # First, gather the list of updates and try pushing to remote. Let the database pick out
+        # the racers that need pushing, rather than going through every racer on every tick.
+        for bib, start, finish in racer_table_model.racer_time_list(exclude_status='remote'):
+            # We mark pushed racers through the model, so leave racers that the model hasn't
+            # fetched yet for a later tick.
+            bib_index = racer_table_model.bib_index(bib)
+            if bib_index is None:
+                continue
 
-            if msecs_is_valid(start) and msecs_is_valid(finish) and (status != 'remote'):
-                racer_update = {'bib': bib,
-                                'start': start,
-                                'finish': finish,
-                                'row': row}
-
-                submit_list.append(racer_update)
+            submit_list.append(RacerUpdate(bib, start, finish, bib_index.row()))
 
         # Only if remote push succeeds, we mark the status as "remote".
         if not submit_list or self.submit_racer_update(submit_list) != Status.Ok:
             return
 
-        for racer_update in submit_list:
-            index = racer_table_model.index(racer_update['row'], racer_status_column)
-            racer_table_model.setData(index, 'remote')
-            racer_table_model.dataChanged.emit(index, index)
+        with self.modeldb.batch():
+            for racer_update in submit_list:
+                index = racer_table_model.index(racer_update.row, racer_status_column)
+                racer_table_model.setData(index, 'remote')
 
 class OnTheDayRemote(Remote):
     """OnTheDay.net remote, to be implemented."""
@@ -490,7 +489,6 @@ class OnTheDayRemote(Remote):
                         racer_table_model.setData(index, '')
                     else:
                         racer_table_model.setData(index, 'remote')
-                    racer_table_model.dataChanged.emit(index, index)
 
                 # Result is rejected. Mark as "rejected", and emit list of errors to log.
                 elif result_status == ontheday.ResultStatus.Rejected:
@@ -518,9 +516,17 @@ class OnTheDayRemote(Remote):
             ontheday_changes = self.changes_list
             self.changes_list = []
 
+        if not ontheday_changes:
+            return
+
         field_table_model = self.modeldb.field_table_model
         racer_table_model = self.modeldb.racer_table_model
 
+        with self.modeldb.batch():
+            self.apply_remote_changes(ontheday_changes, field_table_model, racer_table_model)
+
+    def apply_remote_changes(self, ontheday_changes, field_table_model, racer_table_model):
+        """Apply a list of remote changes (see process_remote_changes()) to our models."""
         for ontheday_change in ontheday_changes:
             for ontheday_entry in ontheday_change['entry_list']:
                 bib = ontheday_entry['race_number']
@@ -153,8 +153,15 @@ def generate_finish_report(modeldb, field_name):
             cat_list = re.split('[, ]+', subfield)
             subfield_list_by_cat.append(cat_list)
 
+    # Filter on the racer table's own field_id column rather than on the joined-in field name, so
+    # that SQLite compares integers on the racer table instead of strings on the field table.
+    # (Comparing against NULL matches nothing, which is what we want for an unknown field.)
+    field_id = modeldb.field_table_model.id_from_name(field_name)
+    if field_id is None:
+        field_id = 'NULL'
+
     model = RacerTableModel(modeldb)
-    model.setFilter('%s = "%s"' % (RacerTableModel.FIELD_ALIAS, field_name))
+    model.setFilter('"%s"."%s" = %s' % (RacerTableModel.TABLE, RacerTableModel.FIELD, field_id))
     model.select()
 
     html = ''
@@ -0,0 +1,37 @@
+"""pytest fixtures shared by the Timing Cat tests."""
+
+import os
+import sys
+import pytest
+
+# The application modules live at the top of the repo, and import each other by bare name.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# No display needed.
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+@pytest.fixture(scope='session')
+def qapp(tmp_path_factory):
+    """Return the QApplication, with settings kept out of the user's real ones."""
+    QtCore = pytest.importorskip('PyQt5.QtCore')
+    QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+
+    QtCore.QSettings.setDefaultFormat(QtCore.QSettings.IniFormat)
+    QtCore.QSettings.setPath(QtCore.QSettings.IniFormat, QtCore.QSettings.UserScope,
+                             str(tmp_path_factory.mktemp('settings')))
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    app.setOrganizationName('Timing Cat Tests')
+    app.setApplicationName('Timing Cat Tests')
+
+    return app
+
+@pytest.fixture
+def modeldb(qapp, tmp_path):
+    """Return a ModelDatabase on a new, empty race file."""
+    del qapp
+    racemodel = pytest.importorskip('racemodel')
+
+    model_database = racemodel.ModelDatabase(str(tmp_path / 'race.rce'), new=True)
+    yield model_database
+    model_database.cleanup()
@@ -0,0 +1,17 @@
+"""Tests for the common helpers."""
+
+import pytest
+
+common = pytest.importorskip('common')
+
+@pytest.mark.parametrize('row_list, run_list', [
+    ([], []),
+    ([4], [(4, 1)]),
+    ([1, 2, 3], [(1, 3)]),
+    ([5, 1, 2, 3, 7, 6], [(1, 3), (5, 3)]),
+    ([3, 3, 2, 9], [(2, 2), (9, 1)]),
+    (iter([8, 0, 10]), [(0, 1), (8, 1), (10, 1)]),
+])
+def test_row_runs(row_list, run_list):
+    """Rows are de-duplicated, sorted, and grouped into (first_row, count) runs."""
+    assert common.row_runs(row_list) == run_list
@@ -0,0 +1,48 @@
+"""Tests for the proxy models."""
+
+import pytest
+
+QtCore = pytest.importorskip('PyQt5.QtCore')
+raceview = pytest.importorskip('raceview')
+proxymodels = pytest.importorskip('proxymodels')
+
+def test_extra_columns_proxy_column_count_follows_source_model(modeldb):
+    """The cached source column count must be fresh by the time anyone hears of a reset."""
+    field_table_model = modeldb.field_table_model
+    racer_table_model = modeldb.racer_table_model
+
+    proxy_model = raceview.FieldProxyModel()
+    proxy_model.setSourceModel(field_table_model)
+    assert proxy_model.columnCount() == field_table_model.columnCount() + 3
+    assert (proxy_model.proxyColumnForExtraColumn(0) ==
+            field_table_model.columnCount())
+
+    # A slot on the proxy's reset, like a view's, should already see the new source model.
+    column_count_list = []
+    proxy_model.modelReset.connect(lambda: column_count_list.append(proxy_model.columnCount()))
+
+    proxy_model.setSourceModel(racer_table_model)
+    assert column_count_list == [racer_table_model.columnCount() + 3]
+    assert proxy_model.columnCount() == racer_table_model.columnCount() + 3
+
+def test_msecs_string_cache_follows_reference_clock(modeldb):
+    """Formatted times are cached, but not past a reference clock change."""
+    race_table_model = modeldb.race_table_model
+    reference_datetime = QtCore.QDateTime(QtCore.QDate(2019, 6, 1), QtCore.QTime(9, 0))
+    race_table_model.enable_reference_clock()
+    race_table_model.set_reference_clock_datetime(reference_datetime)
+
+    proxy_model = proxymodels.MSecsColumnsProxyModel(modeldb)
+    string = proxy_model.msecs_to_string(60 * 1000, True)
+    assert string == reference_datetime.addMSecs(60 * 1000).toString(
+        raceview.defaults.DATETIME_FORMAT)
+    assert (60 * 1000, True) in proxy_model.msecs_string_cache
+
+    new_reference_datetime = reference_datetime.addSecs(60 * 60)
+    race_table_model.set_reference_clock_datetime(new_reference_datetime)
+    assert not proxy_model.msecs_string_cache
+    assert proxy_model.msecs_to_string(60 * 1000, True) == new_reference_datetime.addMSecs(
+        60 * 1000).toString(raceview.defaults.DATETIME_FORMAT)
+
+    race_table_model.select()
+    assert not proxy_model.msecs_string_cache
@@ -0,0 +1,160 @@
+"""Tests for the race table models."""
+
+import pytest
+
+racemodel = pytest.importorskip('racemodel')
+
+def test_add_racer_list_skips_invalid_racers(modeldb):
+    """One bad racer in an import shouldn't keep the others out."""
+    racer_table_model = modeldb.racer_table_model
+
+    error_list = racer_table_model.add_racer_list([
+        (101, 'Good', 'Rider', 'Men', 'Cat 1', 'Team', 30),
+        (101, 'Duplicate', 'Bib', 'Men', 'Cat 1', 'Team', 30),
+        (102, 'Also', 'Good', 'Women', 'Cat 1', 'Team', 30)])
+
+    assert len(error_list) == 1
+    assert 'already being used' in error_list[0]
+    assert racer_table_model.rowCount() == 2
+    assert racer_table_model.bib_index(101) is not None
+    assert racer_table_model.bib_index(102) is not None
+
+def add_racer(modeldb, bib, field, finish=None):
+    """Add a racer with made up details, and optionally a finish time."""
+    if finish is None:
+        modeldb.racer_table_model.add_racer(bib, 'First%s' % bib, 'Last%s' % bib, field, 'Cat 1',
+                                            'Team', 30)
+    else:
+        modeldb.racer_table_model.add_racer(bib, 'First%s' % bib, 'Last%s' % bib, field, 'Cat 1',
+                                            'Team', 30, finish=finish)
+
+def test_field_counts_follow_inserts_finishes_and_deletes(modeldb):
+    """The field count cache shouldn't outlive racer inserts, finishes, or deletes."""
+    racer_table_model = modeldb.racer_table_model
+    modeldb.field_table_model.add_field('Men')
+    modeldb.field_table_model.add_field('Women')
+
+    assert racer_table_model.field_counts('Men') == (0, 0, 'Empty')
+
+    add_racer(modeldb, 101, 'Men')
+    add_racer(modeldb, 102, 'Men')
+    add_racer(modeldb, 201, 'Women', finish=1000)
+    assert racer_table_model.field_counts('Men') == (2, 0, 'In Progress (0%)')
+    assert racer_table_model.field_counts('Women') == (1, 1, 'Complete')
+
+    racer_table_model.set_racer_finish(101, 2000)
+    assert racer_table_model.field_counts('Men') == (2, 1, 'In Progress (50%)')
+
+    racer_table_model.delete_racer(102)
+    assert racer_table_model.field_counts('Men') == (1, 1, 'Complete')
+    assert racer_table_model.field_counts('Women') == (1, 1, 'Complete')
+
+def test_field_counts_thrown_away_on_model_reset(modeldb):
+    """select() (a model reset) should throw away every cached field count."""
+    racer_table_model = modeldb.racer_table_model
+    modeldb.field_table_model.add_field('Men')
+    add_racer(modeldb, 101, 'Men')
+
+    racer_table_model.field_counts('Men')
+    assert racer_table_model.field_count_cache
+
+    racer_table_model.select()
+    assert not racer_table_model.field_count_cache
+    assert racer_table_model.field_counts('Men') == (1, 0, 'In Progress (0%)')
+
+def test_bib_index_follows_inserts_deletes_and_resets(modeldb):
+    """The bib:row dictionary shouldn't outlive racer inserts, deletes, or model resets."""
+    racer_table_model = modeldb.racer_table_model
+    modeldb.field_table_model.add_field('Men')
+
+    assert racer_table_model.bib_index(101) is None
+
+    add_racer(modeldb, 101, 'Men')
+    add_racer(modeldb, 102, 'Men')
+    bib_index = racer_table_model.bib_index(102)
+    assert bib_index is not None
+    assert racer_table_model.data(bib_index) == 102
+    # Bibs come in as text from the result scratch pad, too.
+    assert racer_table_model.bib_index('101') is not None
+
+    racer_table_model.delete_racer(101)
+    assert racer_table_model.bib_index(101) is None
+    bib_index = racer_table_model.bib_index(102)
+    assert racer_table_model.data(bib_index) == 102
+
+    assert racer_table_model.bib_row_dict is not None
+    racer_table_model.select()
+    assert racer_table_model.bib_row_dict is None
+    assert racer_table_model.data(racer_table_model.bib_index(102)) == 102
+
+def test_field_row_lists_follow_inserts_renames_deletes_and_resets(modeldb):
+    """The field name/ID lists should be rebuilt after changes to them, and only then."""
+    field_table_model = modeldb.field_table_model
+    field_table_model.add_field('Men')
+    field_table_model.add_field('Women')
+
+    men_id = field_table_model.id_from_name('Men')
+    assert field_table_model.name_from_id(men_id) == 'Men'
+    assert field_table_model.name_at_row(field_table_model.row_from_name('Women')) == 'Women'
+
+    # Metadata edits don't touch the names or IDs, so the lists stay.
+    row_name_list = field_table_model.row_name_list
+    field_table_model.set_field_metadata('Men', '{}')
+    assert field_table_model.row_name_list is row_name_list
+
+    # Renames do.
+    field_table_model.setData(field_table_model.index(field_table_model.row_from_name('Men'),
+                                                      field_table_model.name_column),
+                              'Men Pro')
+    assert field_table_model.name_from_id(men_id) == 'Men Pro'
+    assert field_table_model.row_from_name('Men') is None
+
+    field_table_model.add_field('Juniors')
+    assert field_table_model.row_from_name('Juniors') is not None
+
+    field_table_model.remove_row_list([field_table_model.row_from_name('Women')])
+    assert field_table_model.row_from_name('Women') is None
+    assert sorted(field_table_model.id_list()) == sorted(
+        [men_id, field_table_model.id_from_name('Juniors')])
+
+    field_table_model.select()
+    assert field_table_model.row_name_list is None
+    assert field_table_model.name_from_id(men_id) == 'Men Pro'
+
+def test_batch_commits_on_success(modeldb):
+    """Writes made in a batch stick once the batch is done."""
+    modeldb.field_table_model.add_field('Men')
+
+    with modeldb.batch():
+        add_racer(modeldb, 101, 'Men')
+        add_racer(modeldb, 102, 'Men')
+
+    assert modeldb.batch_depth == 0
+    modeldb.racer_table_model.select()
+    assert modeldb.racer_table_model.rowCount() == 2
+
+def test_batch_rolls_back_and_reselects_on_error(modeldb):
+    """An exception in a batch (even a nested one) undoes the whole batch, models included."""
+    racer_table_model = modeldb.racer_table_model
+    modeldb.field_table_model.add_field('Men')
+    add_racer(modeldb, 100, 'Men')
+
+    with pytest.raises(RuntimeError):
+        with modeldb.batch():
+            add_racer(modeldb, 101, 'Men')
+            with modeldb.batch():
+                add_racer(modeldb, 102, 'Men')
+                assert racer_table_model.rowCount() == 3
+                raise RuntimeError('Something went wrong')
+
+    assert modeldb.batch_depth == 0
+    # The models were re-selected, so they don't show the rolled back racers.
+    assert racer_table_model.rowCount() == 1
+    assert racer_table_model.bib_index(101) is None
+    assert racer_table_model.bib_index(102) is None
+    assert racer_table_model.field_counts('Men') == (1, 0, 'In Progress (0%)')
+
+    # And a new batch can start.
+    with modeldb.batch():
+        add_racer(modeldb, 101, 'Men')
+    assert racer_table_model.bib_index(101) is not None
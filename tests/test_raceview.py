@@ -0,0 +1,123 @@
+"""Tests for the race views."""
+
+import pytest
+
+QtCore = pytest.importorskip('PyQt5.QtCore')
+QtTest = pytest.importorskip('PyQt5.QtTest')
+raceview = pytest.importorskip('raceview')
+
+def answer_ok(monkeypatch):
+    """Make the delete confirmation boxes answer OK without showing up."""
+    monkeypatch.setattr(raceview.QMessageBox, 'exec', lambda msg_box: raceview.QMessageBox.Ok)
+
+def wait_for_non_model_columns_refresh(view):
+    """Let the field table view's coalescing timer fire."""
+    QtTest.QTest.qWait(view.UPDATE_NON_MODEL_COLUMNS_DELAY_MS * 5)
+    assert not view.update_non_model_columns_timer.isActive()
+
+def test_deleting_racers_refreshes_field_view(modeldb, monkeypatch):
+    """Deleting racers should repaint the field's Finished/Total/Status columns."""
+    modeldb.field_table_model.add_field('Men')
+    modeldb.field_table_model.add_field('Women')
+    racer_table_model = modeldb.racer_table_model
+    racer_table_model.add_racer(101, 'Fast', 'Rider', 'Men', 'Cat 1', 'Team', 30, finish=1000)
+    racer_table_model.add_racer(102, 'Slow', 'Rider', 'Men', 'Cat 1', 'Team', 30)
+    racer_table_model.add_racer(201, 'Other', 'Rider', 'Women', 'Cat 1', 'Team', 30)
+
+    view = raceview.FieldTableView(modeldb)
+    wait_for_non_model_columns_refresh(view)
+
+    proxy_model = view.model()
+    men_row = modeldb.field_table_model.row_from_name('Men')
+    total_column = proxy_model.proxyColumnForExtraColumn(raceview.FieldProxyModel.TOTAL_SECTION)
+    assert proxy_model.index(men_row, total_column).data() == 2
+
+    refresh_list = []
+    original_data_changed = view.dataChanged
+    def data_changed(top_left, bottom_right, roles=()):
+        refresh_list.append((top_left, bottom_right, list(roles)))
+        original_data_changed(top_left, bottom_right, roles)
+    monkeypatch.setattr(view, 'dataChanged', data_changed)
+
+    with modeldb.batch():
+        racer_table_model.remove_row_list([racer_table_model.bib_index(101).row(),
+                                           racer_table_model.bib_index(102).row()])
+    wait_for_non_model_columns_refresh(view)
+
+    # The view was told about the Men row's extra columns, and the counts it will paint are fresh.
+    assert any(top_left.row() <= men_row <= bottom_right.row() and
+               top_left.column() <= total_column <= bottom_right.column() and
+               QtCore.Qt.DisplayRole in roles
+               for top_left, bottom_right, roles in refresh_list)
+    assert proxy_model.index(men_row, total_column).data() == 0
+
+def test_deleting_field_disposes_of_its_racer_view(modeldb, monkeypatch):
+    """Deleting a field should get rid of its field-specific racer view, if one was made."""
+    field_table_model = modeldb.field_table_model
+    field_table_model.add_field('Men')
+    field_table_model.add_field('Women')
+    modeldb.racer_table_model.add_racer(201, 'Some', 'Rider', 'Women', 'Cat 1', 'Team', 30)
+
+    view = raceview.FieldTableView(modeldb)
+    women_id = field_table_model.id_from_name('Women')
+    women_view = view.racer_in_field_table_view(women_id)
+    women_view.show()
+
+    destroyed_list = []
+    women_view.destroyed.connect(lambda: destroyed_list.append(True))
+
+    answer_ok(monkeypatch)
+    view.selectRow(field_table_model.row_from_name('Women'))
+    view.handle_delete()
+
+    assert women_id not in view.racer_in_field_table_view_dict
+    assert set(view.racer_in_field_table_view_dict) == {field_table_model.id_from_name('Men')}
+    assert not women_view.isVisible()
+
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    assert destroyed_list
+
+def test_deleting_fields_selects_field_table_once(modeldb, monkeypatch):
+    """A bulk delete on the (SQL sorted) field view shouldn't re-select just to re-sort."""
+    field_table_model = modeldb.field_table_model
+    field_table_model.add_field('Men')
+    field_table_model.add_field('Women')
+
+    view = raceview.FieldTableView(modeldb)
+    assert view.isSortingEnabled()
+
+    reset_list = []
+    field_table_model.modelReset.connect(lambda: reset_list.append(True))
+
+    answer_ok(monkeypatch)
+    view.selectRow(field_table_model.row_from_name('Women'))
+    view.handle_delete()
+
+    assert len(reset_list) == 1
+    assert view.isSortingEnabled()
+    assert field_table_model.row_from_name('Women') is None
+
+def test_racer_table_view_is_built_on_first_show(modeldb):
+    """Racer views don't set up their proxy models until they are shown."""
+    field_table_model = modeldb.field_table_model
+    field_table_model.add_field('Men')
+    field_table_model.add_field('Women')
+    modeldb.racer_table_model.add_racer(101, 'Some', 'Rider', 'Men', 'Cat 1', 'Team', 30)
+    modeldb.racer_table_model.add_racer(201, 'Other', 'Rider', 'Women', 'Cat 1', 'Team', 30)
+
+    view = raceview.RacerTableView(modeldb, field_table_model.id_from_name('Women'))
+    assert not view.built
+    assert view.model() is None
+    assert view.windowTitle() == 'Racers (Women)'
+
+    # Hiding a view that was never shown has nothing to save, and shouldn't build it.
+    view.write_settings()
+    assert not view.built
+
+    view.show()
+    assert view.built
+    assert view.model() is view.proxy_model_filter
+    assert view.model().rowCount() == 1
+    racer_table_model = modeldb.racer_table_model
+    bib_index = view.model().index(0, racer_table_model.bib_column)
+    assert bib_index.data() == 201